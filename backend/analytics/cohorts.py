@@ -0,0 +1,217 @@
+# analytics/cohorts.py
+from collections import Counter, defaultdict
+from datetime import datetime, time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import DateField, Q
+from django.db.models.functions import Least, TruncWeek
+from django.utils import timezone
+
+from applications.models import Application, ArchivedApplication
+from users.models import JobSeekerProfile
+from .counters import increment
+from .job_stats import local_day
+from .models import ApplicationTimeline, ArchivedApplicationTimeline, CohortActivity, CohortMember, RetentionCohort
+from .trends import week_start
+
+User = get_user_model()
+
+# Weeks after registration reported as headline retention figures
+RETENTION_WEEKS = [1, 4, 12]
+DEFAULT_COHORTS = 12
+MAX_COHORTS = 104
+# First key of the cohort advisory locks, the second being the cohort week's ordinal
+COHORT_LOCK = 0x636F68
+
+
+def current_week():
+    return week_start(timezone.localdate())
+
+
+def lock_cohort(week, exclusive=False):
+    """
+    Hold a cohort's advisory lock until the end of the transaction.
+
+    Incremental updates share it; rebuild_cohort takes it exclusively, so a
+    cohort is never recounted while a change to it is uncommitted.
+    """
+    function = 'pg_advisory_xact_lock' if exclusive else 'pg_advisory_xact_lock_shared'
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT {function}(%s, %s)", [COHORT_LOCK, week.toordinal()])
+
+
+def join_cohort(user_id, date_joined=None):
+    """
+    Add a job seeker to the cohort of their registration week.
+
+    Returns:
+        The cohort week, or None if the user is not a job seeker
+    """
+    if date_joined is None:
+        date_joined = User.objects.filter(pk=user_id, user_type='jobseeker').values_list('date_joined', flat=True).first()
+        if date_joined is None:
+            return None
+    cohort_week = week_start(local_day(date_joined))
+    with transaction.atomic():
+        lock_cohort(cohort_week)
+        member, created = CohortMember.objects.get_or_create(user_id=user_id, defaults={'cohort_week': cohort_week})
+        if created:
+            increment(RetentionCohort, {'week': member.cohort_week}, size=1)
+    return member.cohort_week
+
+
+def record_activity(activities):
+    """
+    Count job seekers active in the weeks of the given (user_id, datetime) activities.
+
+    A conditional UPDATE moves the member's last_active_week forward and only
+    the call that moves it adds to the (cohort_week, activity_week) cell, so
+    repeated or concurrent activity within a week is counted once. Activity
+    older than the member's last active week is left to rebuild_cohorts.
+    Users who predate the cohort tables join their cohort on first activity.
+    Timeline events pass the earlier of their date and when they were recorded.
+    """
+    for user_id, week in sorted({(user_id, week_start(local_day(moment))) for user_id, moment in activities if user_id}):
+        with transaction.atomic():
+            members = CohortMember.objects.filter(user_id=user_id)
+            cohort_week = members.values_list('cohort_week', flat=True).first() or join_cohort(user_id)
+            if cohort_week is None:
+                continue
+            lock_cohort(cohort_week)
+            if members.filter(Q(last_active_week__isnull=True) | Q(last_active_week__lt=week)).update(last_active_week=week):
+                increment(CohortActivity, {'cohort_week': cohort_week, 'activity_week': week}, active_users=1)
+
+
+def record_applied(applications):
+    """Count new applications as activity of their job seekers."""
+    owners = dict(
+        JobSeekerProfile.objects.filter(pk__in={application.jobseeker_id for application in applications})
+        .values_list('pk', 'user_id')
+    )
+    record_activity((owners.get(application.jobseeker_id), application.created_at) for application in applications)
+
+
+def retention_table(cohorts=DEFAULT_COHORTS):
+    """
+    Retention of the latest registration cohorts, read from the precomputed matrix.
+
+    Each cohort lists its active job seekers for every week since it
+    registered (week 0 is the registration week), the same as a share of
+    the cohort, and the headline RETENTION_WEEKS rates; None for weeks that
+    have not happened yet.
+    """
+    start = current_week() - timedelta(weeks=cohorts - 1)
+    cells = defaultdict(dict)
+    for cell in CohortActivity.objects.filter(cohort_week__gte=start):
+        cells[cell.cohort_week][(cell.activity_week - cell.cohort_week).days // 7] = cell.active_users
+
+    table = []
+    for cohort in RetentionCohort.objects.filter(week__gte=start).order_by('week'):
+        elapsed = (current_week() - cohort.week).days // 7
+        active = [cells[cohort.week].get(offset, 0) for offset in range(elapsed + 1)]
+        rates = [round(count / cohort.size, 4) if cohort.size else 0.0 for count in active]
+        row = {'cohort_week': cohort.week, 'size': cohort.size, 'active': active, 'retention': rates}
+        for week in RETENTION_WEEKS:
+            row[f'week_{week}'] = rates[week] if week < len(rates) else None
+        table.append(row)
+    return table
+
+
+def active_weeks(user_ids):
+    """Distinct weeks each job seeker applied or had a timeline event in, live or archived; keyed by user id."""
+    weeks = defaultdict(set)
+    by_week = TruncWeek('created_at', output_field=DateField())
+    for model in (Application, ArchivedApplication):
+        for user_id, week in (
+            model.objects.filter(jobseeker__user_id__in=user_ids).annotate(week=by_week)
+            .order_by().values_list('jobseeker__user_id', 'week').distinct()
+        ):
+            weeks[user_id].add(week)
+    event_week = TruncWeek(Least('event_date', 'recorded_at'), output_field=DateField())
+    for user_id, week in (
+        ApplicationTimeline.objects.filter(user_id__in=user_ids).annotate(week=event_week)
+        .order_by().values_list('user_id', 'week').distinct()
+    ):
+        weeks[user_id].add(week)
+    archived_owners = dict(
+        ArchivedApplication.objects.filter(jobseeker__user_id__in=user_ids).values_list('pk', 'jobseeker__user_id')
+    )
+    for application_id, week in (
+        ArchivedApplicationTimeline.objects.filter(application_id__in=list(archived_owners)).annotate(week=event_week)
+        .order_by().values_list('application_id', 'week').distinct()
+    ):
+        weeks[archived_owners[application_id]].add(week)
+    return weeks
+
+
+def rebuild_cohort(week, batch_size=1000):
+    """
+    Recount one cohort: its members, its size and its row of the activity matrix.
+
+    Runs in one transaction holding the cohort lock exclusively. Activity
+    recorded meanwhile has either committed and is scanned, or waits and is
+    counted on top of the recount, so nothing is lost or counted twice.
+
+    Returns:
+        The size of the cohort
+    """
+    start = timezone.make_aware(datetime.combine(week, time.min))
+    end = timezone.make_aware(datetime.combine(week + timedelta(weeks=1), time.min))
+    with transaction.atomic():
+        lock_cohort(week, exclusive=True)
+        user_ids = list(
+            User.objects.filter(user_type='jobseeker', date_joined__gte=start, date_joined__lt=end)
+            .order_by('pk').values_list('pk', flat=True)
+        )
+        cells = Counter()
+        for offset in range(0, len(user_ids), batch_size):
+            batch = user_ids[offset:offset + batch_size]
+            weeks = active_weeks(batch)
+            for user_id in batch:
+                cells.update(weeks[user_id])
+            CohortMember.objects.bulk_create(
+                [
+                    CohortMember(user_id=user_id, cohort_week=week, last_active_week=max(weeks[user_id], default=None))
+                    for user_id in batch
+                ],
+                update_conflicts=True, unique_fields=['user'], update_fields=['cohort_week', 'last_active_week'],
+            )
+
+        CohortActivity.objects.filter(cohort_week=week).delete()
+        CohortActivity.objects.bulk_create([
+            CohortActivity(cohort_week=week, activity_week=activity_week, active_users=count)
+            for activity_week, count in cells.items()
+        ])
+        if user_ids:
+            RetentionCohort.objects.update_or_create(week=week, defaults={'size': len(user_ids)})
+        else:
+            RetentionCohort.objects.filter(week=week).delete()
+    return len(user_ids)
+
+
+def rebuild_cohorts(batch_size=1000, stdout=None):
+    """
+    Recompute cohort membership, sizes and the activity matrix from source.
+
+    Rebuilds one registration cohort at a time with rebuild_cohort, so the
+    tables stay live throughout and only the cohort being recounted holds
+    back activity recorded for it. Cohorts left without job seekers are
+    dropped.
+
+    Returns:
+        The number of job seekers processed
+    """
+    weeks = set(RetentionCohort.objects.values_list('week', flat=True))
+    weeks.update(CohortActivity.objects.order_by().values_list('cohort_week', flat=True).distinct())
+    weeks.update(
+        User.objects.filter(user_type='jobseeker')
+        .annotate(week=TruncWeek('date_joined', output_field=DateField()))
+        .order_by().values_list('week', flat=True).distinct()
+    )
+    total = 0
+    for week in sorted(weeks):
+        total += rebuild_cohort(week, batch_size=batch_size)
+        if stdout is not None:
+            stdout.write(f"Rebuilt the cohort of {week} ({total} job seekers so far)")
+    return total
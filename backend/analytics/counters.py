@@ -0,0 +1,26 @@
+# analytics/counters.py
+from django.db import IntegrityError, transaction
+from django.db.models import F
+
+
+def increment(model, lookup, **deltas):
+    """
+    Add to counter columns of the row matching ``lookup``, creating it when missing.
+
+    The common case is a single ``UPDATE ... SET n = n + delta``. A concurrent
+    insert of the same row is caught by the unique constraint on the lookup
+    fields and retried as an update, so no increment is lost.
+
+    Args:
+        model: Model with a unique constraint over the lookup fields
+        lookup: Field values identifying the row, e.g. {'user_id': 1, 'bucket_start': date}
+        **deltas: Amount to add to each counter field
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**updates)
@@ -0,0 +1,201 @@
+# analytics/export.py
+"""
+Columnar export of the analytics source tables for offline analysis.
+
+Rows are read through a server-side cursor and written out as Parquet or
+Arrow IPC row groups as they arrive, so memory stays bounded by one row
+group whatever the size of the table. The output is produced as a stream
+of byte chunks that callers send to a file or an HTTP response. Consume
+them inside a transaction (config.utils.atomic_stream for responses), or
+PostgreSQL materialises the whole result behind a WITH HOLD cursor first.
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow not installed, exports will be refused
+    pa = pq = None
+
+from applications.models import Application
+from jobs.models import Job
+from .models import ApplicationTimeline, CompanyAnalytics
+
+FORMATS = {
+    'parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+ROW_GROUP_SIZE = 100_000
+# Rows fetched per round trip of the server-side cursor
+CURSOR_CHUNK_SIZE = 10_000
+
+
+class ExportUnavailable(Exception):
+    """pyarrow is not installed."""
+
+
+class ExportTable:
+    """A model exported as a fixed list of typed columns, filterable by date and company."""
+
+    def __init__(self, model, columns, date_field, company_field):
+        # columns: (output name, ORM lookup, arrow type name)
+        self.model = model
+        self.columns = columns
+        self.date_field = date_field
+        self.company_field = company_field
+
+    def schema(self):
+        types = {
+            'int64': pa.int64(),
+            'float64': pa.float64(),
+            'string': pa.string(),
+            'date': pa.date32(),
+            'timestamp': pa.timestamp('us', tz='UTC'),
+        }
+        return pa.schema([(name, types[type_name]) for name, _, type_name in self.columns])
+
+    def queryset(self, since=None, until=None, company_id=None):
+        # Day bounds are turned into datetimes so the date column's index stays usable
+        queryset = self.model.objects.order_by()
+        if since is not None:
+            start = timezone.make_aware(datetime.combine(since, time.min))
+            queryset = queryset.filter(**{f'{self.date_field}__gte': start})
+        if until is not None:
+            end = timezone.make_aware(datetime.combine(until + timedelta(days=1), time.min))
+            queryset = queryset.filter(**{f'{self.date_field}__lt': end})
+        if company_id is not None:
+            queryset = queryset.filter(**{self.company_field: company_id})
+        return queryset.values_list(*[lookup for _, lookup, _ in self.columns])
+
+
+# Free-text and file columns (cover letters, descriptions, resumes) are left out
+TABLES = {
+    'applications': ExportTable(Application, [
+        ('id', 'id', 'int64'),
+        ('job_id', 'job_id', 'int64'),
+        ('company_id', 'job__company_id', 'int64'),
+        ('jobseeker_id', 'jobseeker_id', 'int64'),
+        ('status', 'status', 'string'),
+        ('created_at', 'created_at', 'timestamp'),
+        ('updated_at', 'updated_at', 'timestamp'),
+    ], date_field='created_at', company_field='job__company_id'),
+    'jobs': ExportTable(Job, [
+        ('id', 'id', 'int64'),
+        ('company_id', 'company_id', 'int64'),
+        ('title', 'title', 'string'),
+        ('location', 'location', 'string'),
+        ('salary', 'salary', 'string'),
+        ('employment_type', 'employment_type', 'string'),
+        ('experience_level', 'experience_level', 'string'),
+        ('status', 'status', 'string'),
+        ('application_deadline', 'application_deadline', 'date'),
+        ('created_at', 'created_at', 'timestamp'),
+        ('updated_at', 'updated_at', 'timestamp'),
+    ], date_field='created_at', company_field='company_id'),
+    'timeline': ExportTable(ApplicationTimeline, [
+        ('id', 'id', 'int64'),
+        ('application_id', 'application_id', 'int64'),
+        ('user_id', 'user_id', 'int64'),
+        ('company_id', 'application__job__company_id', 'int64'),
+        ('event_type', 'event_type', 'string'),
+        ('event_date', 'event_date', 'timestamp'),
+    ], date_field='event_date', company_field='application__job__company_id'),
+    'company_analytics': ExportTable(CompanyAnalytics, [
+        ('id', 'id', 'int64'),
+        ('company_id', 'company_id', 'int64'),
+        ('company_name', 'company_name', 'string'),
+        ('total_applications', 'total_applications', 'int64'),
+        ('success_rate', 'success_rate', 'float64'),
+        ('average_process_duration', 'average_process_duration', 'float64'),
+        ('process_count', 'process_count', 'int64'),
+        ('last_updated', 'last_updated', 'timestamp'),
+    ], date_field='last_updated', company_field='company_id'),
+}
+
+
+class StreamSink:
+    """Write-only file object that hands back what was written since the last drain."""
+
+    def __init__(self):
+        self.chunks = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data):
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+
+class TableExport:
+    """
+    One table exported as a Parquet or Arrow IPC file.
+
+    Raises:
+        ValueError: For an unknown table or format
+        ExportUnavailable: If pyarrow is not installed
+    """
+
+    def __init__(self, table, fmt='parquet', since=None, until=None, company_id=None, row_group_size=ROW_GROUP_SIZE):
+        if table not in TABLES:
+            raise ValueError(f"table must be one of: {', '.join(TABLES)}")
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of: {', '.join(FORMATS)}")
+        if pa is None:
+            raise ExportUnavailable("pyarrow is not installed")
+        self.table = table
+        self.fmt = fmt
+        self.spec = TABLES[table]
+        self.filters = {'since': since, 'until': until, 'company_id': company_id}
+        self.row_group_size = row_group_size
+        self.rows = 0
+
+    @property
+    def filename(self):
+        return f"{self.table}.{FORMATS[self.fmt][0]}"
+
+    @property
+    def content_type(self):
+        return FORMATS[self.fmt][1]
+
+    def batches(self, schema):
+        rows = []
+        for row in self.spec.queryset(**self.filters).iterator(chunk_size=CURSOR_CHUNK_SIZE):
+            rows.append(row)
+            if len(rows) >= self.row_group_size:
+                yield pa.record_batch([list(column) for column in zip(*rows)], schema=schema)
+                rows = []
+        if rows:
+            yield pa.record_batch([list(column) for column in zip(*rows)], schema=schema)
+
+    def chunks(self):
+        """Yield the file as byte chunks, one per row group plus the footer."""
+        schema = self.spec.schema()
+        sink = StreamSink()
+        if self.fmt == 'parquet':
+            writer = pq.ParquetWriter(sink, schema, compression='zstd')
+        else:
+            writer = pa.ipc.new_file(sink, schema)
+        for batch in self.batches(schema):
+            writer.write_batch(batch)
+            self.rows += batch.num_rows
+            yield sink.drain()
+        writer.close()
+        yield sink.drain()
@@ -0,0 +1,107 @@
+# analytics/funnel.py
+from collections import Counter
+
+from django.core.cache import cache
+from django.db.models import Case, Count, IntegerField, Max, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+from config.utils import bump_cache_version, cache_version
+from jobs.models import Job
+from .models import StatusTransition
+
+# Funnel stages in order; Rejected and Withdrawn are exits, not stages
+FUNNEL_STAGES = ['New', 'Under Review', 'Shortlisted', 'Interviewed', 'Offer', 'Hired']
+FUNNEL_CACHE_TIMEOUT = 60 * 60
+
+
+def funnel_scope(kind, pk):
+    return f"funnel:{kind}:{pk}"
+
+
+def invalidate_funnels(jobseeker_ids, job_ids):
+    """Drop the cached funnels of the candidates and the companies owning the jobs, on commit."""
+    for jobseeker_id in set(jobseeker_ids):
+        bump_cache_version(funnel_scope('jobseeker', jobseeker_id))
+    for company_id in set(Job.objects.filter(pk__in=set(job_ids)).values_list('company_id', flat=True)):
+        bump_cache_version(funnel_scope('company', company_id))
+
+
+def stage_rank(field):
+    """Position of a status column in FUNNEL_STAGES; exit statuses rank with 'New'."""
+    return Case(
+        *[When(**{field: stage}, then=Value(rank)) for rank, stage in enumerate(FUNNEL_STAGES)],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def furthest_stage():
+    """
+    Furthest funnel stage an application reached, as a rank.
+
+    Takes the highest of its current status and every status it passed through
+    in its recorded transitions, so an application rejected after an interview
+    still counts as interviewed.
+    """
+    reached = (
+        StatusTransition.objects.filter(application=OuterRef('pk'))
+        .order_by().values('application')
+        .annotate(rank=Max(Greatest(stage_rank('from_status'), stage_rank('to_status'))))
+        .values('rank')
+    )
+    return Greatest(stage_rank('status'), Coalesce(Subquery(reached), Value(0)))
+
+
+def summarize(counts):
+    """Turn {furthest rank: applications} into reached counts and rates per stage."""
+    total = sum(counts.values())
+    stages = []
+    reached = total
+    for rank, stage in enumerate(FUNNEL_STAGES):
+        stages.append({
+            'stage': stage,
+            'reached': reached,
+            'rate': round(reached / total, 4) if total else 0.0,
+        })
+        reached -= counts.get(rank, 0)
+    return {'total': total, 'stages': stages}
+
+
+def build_funnel(applications, by_job=False):
+    """
+    Funnel of a set of applications, optionally with one funnel per job.
+
+    One query: the furthest stage of every application, counted per (job,
+    stage). Reached counts are then cumulated over at most six stages.
+    """
+    group = ['job_id', 'job__title'] if by_job else []
+    rows = (
+        applications.annotate(furthest=furthest_stage())
+        .order_by().values(*group, 'furthest').annotate(count=Count('id'))
+    )
+    overall = Counter()
+    jobs = {}
+    for row in rows:
+        overall[row['furthest']] += row['count']
+        if by_job:
+            job = jobs.setdefault(row['job_id'], {'title': row['job__title'], 'counts': Counter()})
+            job['counts'][row['furthest']] += row['count']
+
+    funnel = summarize(overall)
+    if by_job:
+        funnel['by_job'] = [
+            {'job_id': job_id, 'job_title': job['title'], **summarize(job['counts'])}
+            for job_id, job in sorted(jobs.items())
+        ]
+    return funnel
+
+
+def get_cached_funnel(kind, pk, applications, by_job=False, variant='all'):
+    """Return a funnel, rebuilding it only after an application of the scope changed."""
+    version = cache_version(funnel_scope(kind, pk))
+    key = f"funnel:{kind}:{pk}:{variant}"
+    funnel = cache.get(key, version=version)
+    if funnel is None:
+        funnel = build_funnel(applications, by_job=by_job)
+        cache.set(key, funnel, FUNNEL_CACHE_TIMEOUT, version=version)
+    return funnel
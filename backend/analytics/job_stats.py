@@ -0,0 +1,198 @@
+# analytics/job_stats.py
+from collections import Counter, defaultdict
+from itertools import chain, groupby
+from operator import itemgetter
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from applications.archive import archived_with_transitions
+from applications.models import Application, ArchivedApplication
+from jobs.models import Job
+from .models import JobDailyStats, StatusTransition
+from .sketches import QuantileSketch
+
+HIRED = 'Hired'
+
+
+def local_day(moment):
+    return timezone.localtime(moment).date()
+
+
+def update_day(job_id, day, applications=0, statuses=None, review=None, hire=None, create_missing=True):
+    """
+    Fold events into the (job, day) row, under a row lock.
+
+    Args:
+        statuses: Counter of status count changes, e.g. {'New': -1, 'Under Review': 1}
+        review: Seconds to first review of one application reviewed on this day
+        hire: Seconds to hire of one application hired on this day
+        create_missing: Deletions pass False, so a cascade from the job being
+            deleted never recreates a row for it
+    """
+    with transaction.atomic():
+        rows = JobDailyStats.objects.select_for_update()
+        if create_missing:
+            stats, _ = rows.get_or_create(job_id=job_id, day=day)
+        else:
+            stats = rows.filter(job_id=job_id, day=day).first()
+            if stats is None:
+                return
+        stats.applications += applications
+        for status, delta in (statuses or {}).items():
+            stats.status_changes[status] = stats.status_changes.get(status, 0) + delta
+        if review is not None:
+            sketch = QuantileSketch(stats.review_sketch)
+            sketch.add(review)
+            stats.review_sketch = sketch.to_json()
+            stats.first_reviews += 1
+        if hire is not None:
+            sketch = QuantileSketch(stats.hire_sketch)
+            sketch.add(hire)
+            stats.hire_sketch = sketch.to_json()
+            stats.hires += 1
+        stats.save()
+
+
+def record_applied(applications):
+    """Count new applications, one row update per (job, day) they fall on."""
+    groups = defaultdict(Counter)
+    for application in applications:
+        groups[(application.job_id, local_day(application.created_at))][application.status] += 1
+    for (job_id, day), statuses in groups.items():
+        update_day(job_id, day, applications=sum(statuses.values()), statuses=statuses)
+
+
+def record_status_change(application, previous_status, changed_at, first_review, first_hire):
+    elapsed = max((changed_at - application.created_at).total_seconds(), 0.0)
+    update_day(
+        application.job_id,
+        local_day(changed_at),
+        statuses={previous_status: -1, application.status: 1},
+        review=elapsed if first_review else None,
+        hire=elapsed if first_hire else None,
+    )
+
+
+def record_deleted(application):
+    # Booked on the day it applied, so the row is known to exist; applicants per day keeps it
+    update_day(
+        application.job_id, local_day(application.created_at),
+        statuses={application.status: -1}, create_missing=False,
+    )
+
+
+def job_summary(job):
+    """
+    Applicants per day, status distribution and time-to-review/hire medians of a job.
+
+    Reads the job's JobDailyStats rows only, so the cost grows with the days
+    the posting has been open and not with its applicants.
+    """
+    per_day = []
+    distribution = Counter()
+    reviews, hires = QuantileSketch(), QuantileSketch()
+    for stats in JobDailyStats.objects.filter(job=job).order_by('day'):
+        if stats.applications:
+            per_day.append({'day': stats.day, 'applications': stats.applications})
+        distribution.update(stats.status_changes)
+        reviews.merge(QuantileSketch(stats.review_sketch))
+        hires.merge(QuantileSketch(stats.hire_sketch))
+
+    def median_days(sketch):
+        value = sketch.quantile(0.5)
+        return round(value / 86400, 2) if value is not None else None
+
+    return {
+        'job_id': job.pk,
+        'title': job.title,
+        'total_applications': sum(distribution.values()),
+        'applicants_per_day': per_day,
+        'status_distribution': {status: count for status, count in sorted(distribution.items()) if count},
+        'time_to_first_review': {'count': reviews.count, 'median_days': median_days(reviews)},
+        'time_to_hire': {'count': hires.count, 'median_days': median_days(hires)},
+    }
+
+
+def live_transitions(job_ids):
+    """Yield (job_id, created_at, transitions oldest first) of the live applications of some jobs that moved."""
+    rows = (
+        StatusTransition.objects.filter(application__job_id__in=job_ids)
+        .order_by('application_id', 'changed_at', 'id')
+        .values('application__job_id', 'application__created_at', 'application_id',
+                'from_status', 'to_status', 'changed_at')
+        .iterator(chunk_size=2000)
+    )
+    for _, group in groupby(rows, key=itemgetter('application_id')):
+        transitions = list(group)
+        yield transitions[0]['application__job_id'], transitions[0]['application__created_at'], transitions
+
+
+def rebuild_job_stats(batch_size=200, stdout=None):
+    """
+    Recompute JobDailyStats from the applications and transitions tables, in batches of jobs.
+
+    Current statuses are booked on each application's apply day; reviews and
+    hires on the day of the first matching transition. Archived applications
+    count the same, their transitions read from the history.
+
+    Returns:
+        The number of jobs processed
+    """
+    last_pk = 0
+    total = 0
+    while True:
+        job_ids = list(Job.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not job_ids:
+            break
+        rows = defaultdict(lambda: {
+            'applications': 0, 'status_changes': Counter(),
+            'reviews': QuantileSketch(), 'hires': QuantileSketch(),
+        })
+        for model in (Application, ArchivedApplication):
+            for row in (
+                model.objects.filter(job_id__in=job_ids)
+                .annotate(day=TruncDate('created_at'))
+                .order_by().values('job_id', 'day', 'status')
+                .annotate(count=Count('id'))
+            ):
+                stats = rows[(row['job_id'], row['day'])]
+                stats['applications'] += row['count']
+                stats['status_changes'][row['status']] += row['count']
+
+        histories = chain(
+            live_transitions(job_ids),
+            archived_with_transitions(ArchivedApplication.objects.filter(job_id__in=job_ids), 'job_id', 'created_at'),
+        )
+        for job_id, created_at, transitions in histories:
+            if not transitions:
+                continue
+            first = transitions[0]
+            if first['from_status'] == 'New':
+                rows[(job_id, local_day(first['changed_at']))]['reviews'].add(
+                    max((first['changed_at'] - created_at).total_seconds(), 0.0)
+                )
+            hire = next((t['changed_at'] for t in transitions if t['to_status'] == HIRED), None)
+            if hire is not None:
+                rows[(job_id, local_day(hire))]['hires'].add(max((hire - created_at).total_seconds(), 0.0))
+
+        with transaction.atomic():
+            JobDailyStats.objects.filter(job_id__in=job_ids).delete()
+            JobDailyStats.objects.bulk_create([
+                JobDailyStats(
+                    job_id=job_id, day=day,
+                    applications=stats['applications'],
+                    status_changes=dict(stats['status_changes']),
+                    first_reviews=stats['reviews'].count, review_sketch=stats['reviews'].to_json(),
+                    hires=stats['hires'].count, hire_sketch=stats['hires'].to_json(),
+                )
+                for (job_id, day), stats in rows.items()
+            ], batch_size=1000)
+
+        total += len(job_ids)
+        last_pk = job_ids[-1]
+        if stdout is not None:
+            stdout.write(f"Rebuilt stats for {total} jobs (last job id {last_pk})")
+    return total
@@ -0,0 +1,38 @@
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from analytics.export import FORMATS, ROW_GROUP_SIZE, TABLES, ExportUnavailable, TableExport
+
+
+class Command(BaseCommand):
+    help = "Export analytics source tables as Parquet or Arrow files, streamed in row groups."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tables', nargs='*', metavar='table',
+                            help=f"Tables to export ({', '.join(TABLES)}); all by default.")
+        parser.add_argument('--format', choices=list(FORMATS), default='parquet')
+        parser.add_argument('--output-dir', default='.')
+        parser.add_argument('--since', type=date.fromisoformat, help="First day to include (YYYY-MM-DD).")
+        parser.add_argument('--until', type=date.fromisoformat, help="Last day to include (YYYY-MM-DD).")
+        parser.add_argument('--company', type=int, help="Only export rows of this company id.")
+        parser.add_argument('--row-group-size', type=int, default=ROW_GROUP_SIZE)
+
+    def handle(self, *args, **options):
+        os.makedirs(options['output_dir'], exist_ok=True)
+        for table in options['tables'] or list(TABLES):
+            try:
+                export = TableExport(
+                    table, options['format'],
+                    since=options['since'], until=options['until'], company_id=options['company'],
+                    row_group_size=options['row_group_size'],
+                )
+            except (ValueError, ExportUnavailable) as e:
+                raise CommandError(str(e))
+            path = os.path.join(options['output_dir'], export.filename)
+            with open(path, 'wb') as output, transaction.atomic():
+                for chunk in export.chunks():
+                    output.write(chunk)
+            self.stdout.write(self.style.SUCCESS(f"Exported {export.rows} rows to {path}."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from analytics.metrics import rebuild_metrics
+
+
+class Command(BaseCommand):
+    help = "Recompute every candidate's dashboard metrics from the applications table, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_metrics(batch_size=options['batch_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt metrics for {total} candidates."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from analytics.cohorts import rebuild_cohorts
+
+
+class Command(BaseCommand):
+    help = "Recompute job seeker cohorts and the weekly retention matrix from applications and timeline events."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        total = rebuild_cohorts(batch_size=options['batch_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt cohorts for {total} job seekers."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from analytics.trends import rebuild_trends
+
+
+class Command(BaseCommand):
+    help = "Recompute the daily and weekly event trend rollups from the timeline tables, in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = rebuild_trends(batch_size=options['batch_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt trends for {total} job seekers."))
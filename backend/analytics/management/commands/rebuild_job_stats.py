@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from analytics.job_stats import rebuild_job_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-job daily stats from the applications and status transitions, in batches of jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        total = rebuild_job_stats(batch_size=options['batch_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {total} jobs."))
@@ -0,0 +1,17 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from analytics.uniques import rebuild_unique_sketches
+
+
+class Command(BaseCommand):
+    help = "Recompute the unique applicant sketches from live and archived applications."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', type=date.fromisoformat,
+                            help="Only rebuild days from this one on (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        total = rebuild_unique_sketches(since=options['since'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt unique applicant sketches for {total} days."))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from analytics.rollups import run_company_rollup
+
+
+class Command(BaseCommand):
+    help = "Recompute CompanyAnalytics for companies whose applications changed since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help="Recompute every company, e.g. nightly, to account for deleted applications.")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        total = run_company_rollup(full=options['full'], batch_size=options['batch_size'], stdout=self.stdout)
+        self.stdout.write(self.style.SUCCESS(f"Rolled up {total} companies."))
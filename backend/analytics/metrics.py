@@ -0,0 +1,178 @@
+# analytics/metrics.py
+from collections import Counter, defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from applications.archive import archived_with_transitions
+from applications.models import Application, ArchivedApplication
+from users.models import JobSeekerProfile
+from .models import ApplicationMetrics, StatusTransition
+
+# ApplicationMetrics counter fed by each application status, besides total_applications
+STATUS_COUNTERS = {
+    'New': 'applications_in_progress',
+    'Under Review': 'applications_in_progress',
+    'Shortlisted': 'applications_in_progress',
+    'Interviewed': 'interviews_scheduled',
+    'Offer': 'offers_received',
+    'Rejected': 'rejections',
+}
+
+COUNTER_FIELDS = [
+    'total_applications', 'applications_in_progress', 'interviews_scheduled',
+    'offers_received', 'rejections',
+]
+RESPONSE_FIELDS = ['response_time_total', 'response_count', 'average_response_time']
+
+
+def status_deltas(status, sign=1):
+    """Counter changes for adding (sign=1) or removing (sign=-1) one application in a status."""
+    deltas = Counter({'total_applications': sign})
+    if status in STATUS_COUNTERS:
+        deltas[STATUS_COUNTERS[status]] += sign
+    return deltas
+
+
+def counts_from_source(jobseeker_ids):
+    """
+    Recount the metrics of several candidates; keyed by jobseeker id.
+
+    One grouped query for the status counters and one for the response time,
+    which runs from applying to the first move out of 'New'. Archived
+    applications count the same, their transitions read from the history.
+    """
+    counts = defaultdict(Counter)
+    for model in (Application, ArchivedApplication):
+        rows = (
+            model.objects.filter(jobseeker_id__in=jobseeker_ids)
+            .order_by().values('jobseeker_id', 'status').annotate(count=Count('id'))
+        )
+        for row in rows:
+            for field, delta in status_deltas(row['status'], row['count']).items():
+                counts[row['jobseeker_id']][field] += delta
+
+    first_transition = StatusTransition.objects.filter(application=OuterRef('pk')).order_by('changed_at', 'id')
+    responses = (
+        Application.objects.filter(jobseeker_id__in=jobseeker_ids)
+        .annotate(first_from=Subquery(first_transition.values('from_status')[:1]))
+        .filter(first_from='New')
+        .order_by().values('jobseeker_id').annotate(
+            total=Sum(ExpressionWrapper(
+                Subquery(first_transition.values('changed_at')[:1]) - F('created_at'), output_field=DurationField()
+            )),
+            count=Count('id'),
+        )
+    )
+    for row in responses:
+        counts[row['jobseeker_id']].update({
+            'response_time_total': row['total'].total_seconds() / 86400,
+            'response_count': row['count'],
+        })
+    for jobseeker_id, created_at, transitions in archived_with_transitions(
+        ArchivedApplication.objects.filter(jobseeker_id__in=jobseeker_ids), 'jobseeker_id', 'created_at'
+    ):
+        if transitions and transitions[0]['from_status'] == 'New':
+            counts[jobseeker_id].update({
+                'response_time_total': (transitions[0]['changed_at'] - created_at).total_seconds() / 86400,
+                'response_count': 1,
+            })
+    for candidate in counts.values():
+        if candidate['response_count']:
+            candidate['average_response_time'] = candidate['response_time_total'] / candidate['response_count']
+    return counts
+
+
+def apply_deltas(jobseeker_id, deltas, create_missing=True):
+    """
+    Add counter changes to a candidate's metrics row with a single UPDATE.
+
+    A missing row is built from source instead, which already includes the
+    change being recorded. Deletions pass create_missing=False so a cascade
+    from a user being deleted never recreates their row.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    user_id = JobSeekerProfile.objects.filter(pk=jobseeker_id).values_list('user_id', flat=True).first()
+    if user_id is None:
+        return
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    updates['last_updated'] = timezone.now()
+    if ApplicationMetrics.objects.filter(user_id=user_id).update(**updates) or not create_missing:
+        return
+    try:
+        with transaction.atomic():
+            ApplicationMetrics.objects.create(user_id=user_id, **counts_from_source([jobseeker_id])[jobseeker_id])
+    except IntegrityError:
+        # Created concurrently; that row may not see this change yet, so apply it
+        ApplicationMetrics.objects.filter(user_id=user_id).update(**updates)
+
+
+def record_created(applications):
+    """Count new applications, grouped so each candidate's row is updated once."""
+    deltas = defaultdict(Counter)
+    for application in applications:
+        deltas[application.jobseeker_id].update(status_deltas(application.status))
+    for jobseeker_id, changes in deltas.items():
+        apply_deltas(jobseeker_id, changes)
+
+
+def record_status_change(application, previous_status):
+    deltas = status_deltas(application.status)
+    deltas.subtract(status_deltas(previous_status))
+    apply_deltas(application.jobseeker_id, deltas)
+
+
+def record_deleted(application):
+    apply_deltas(application.jobseeker_id, status_deltas(application.status, -1), create_missing=False)
+
+
+def get_metrics(user):
+    """The user's metrics row, or an unsaved all-zero row; never writes."""
+    return ApplicationMetrics.objects.filter(user=user).first() or ApplicationMetrics(user=user)
+
+
+def rebuild_metrics(batch_size=1000, stdout=None):
+    """
+    Recompute every candidate's metrics from the live and archived applications and their transitions.
+
+    Works through job seekers in primary key batches: one grouped count, one
+    read of the existing rows, then one bulk update and one bulk insert per
+    batch.
+
+    Returns:
+        The number of candidates processed
+    """
+    last_pk = 0
+    total = 0
+    while True:
+        profiles = list(
+            JobSeekerProfile.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'user_id')[:batch_size]
+        )
+        if not profiles:
+            break
+        with transaction.atomic():
+            counts = counts_from_source([pk for pk, _ in profiles])
+            existing = {
+                metrics.user_id: metrics
+                for metrics in ApplicationMetrics.objects.select_for_update().filter(
+                    user_id__in=[user_id for _, user_id in profiles]
+                )
+            }
+            now = timezone.now()
+            to_update, to_create = [], []
+            for jobseeker_id, user_id in profiles:
+                metrics = existing.get(user_id) or ApplicationMetrics(user_id=user_id)
+                for field in COUNTER_FIELDS + RESPONSE_FIELDS:
+                    setattr(metrics, field, counts[jobseeker_id][field])
+                metrics.last_updated = now
+                (to_update if metrics.pk else to_create).append(metrics)
+            ApplicationMetrics.objects.bulk_update(to_update, COUNTER_FIELDS + RESPONSE_FIELDS + ['last_updated'])
+            ApplicationMetrics.objects.bulk_create(to_create)
+        total += len(profiles)
+        last_pk = profiles[-1][0]
+        if stdout is not None:
+            stdout.write(f"Rebuilt metrics for {total} candidates (last profile id {last_pk})")
+    return total
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 07:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_interviewquestion_practiceanswer'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplicationTimeline',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('application_id', models.BigIntegerField(db_index=True)),
+                ('event_type', models.CharField(max_length=50)),
+                ('event_date', models.DateTimeField()),
+                ('notes', models.TextField(blank=True, null=True)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-event_date'],
+            },
+        ),
+    ]
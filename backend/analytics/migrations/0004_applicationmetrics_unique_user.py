@@ -0,0 +1,31 @@
+# Generated by Django 5.2 on 2026-10-19 08:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def drop_duplicate_metrics(apps, schema_editor):
+    """Keep the newest metrics row per user; the reconcile command recomputes it anyway."""
+    schema_editor.execute(
+        """
+        DELETE FROM analytics_applicationmetrics AS m
+        USING analytics_applicationmetrics AS newer
+        WHERE newer.user_id = m.user_id AND newer.id > m.id
+        """
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_archivedapplicationtimeline'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_metrics, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='applicationmetrics',
+            constraint=models.UniqueConstraint(fields=('user',), name='appmetrics_unique_user'),
+        ),
+    ]
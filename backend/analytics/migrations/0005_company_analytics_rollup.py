@@ -0,0 +1,36 @@
+# Generated by Django 5.2 on 2026-10-19 08:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_applicationmetrics_unique_user'),
+        ('users', '0006_resumeblob_extraction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_run_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='companyanalytics',
+            name='company',
+            field=models.OneToOneField(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='analytics', to='users.companyprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='companyanalytics',
+            index=models.Index(fields=['total_applications'], name='companyanalytics_total_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='companyanalytics',
+            index=models.Index(fields=['success_rate'], name='companyanalytics_success_idx'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-19 08:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_timeline_users(apps, schema_editor):
+    """Copy the owner of each application onto its existing timeline events."""
+    schema_editor.execute(
+        """
+        UPDATE analytics_applicationtimeline AS t
+        SET user_id = p.user_id
+        FROM applications_application AS a
+        JOIN users_jobseekerprofile AS p ON p.id = a.jobseeker_id
+        WHERE a.id = t.application_id
+        """
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0006_eventtrend'),
+        ('applications', '0014_application_updated_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationtimeline',
+            name='user',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timeline_events', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_timeline_users, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='applicationtimeline',
+            index=models.Index(fields=['user', '-event_date', '-id'], name='timeline_user_date_idx'),
+        ),
+    ]
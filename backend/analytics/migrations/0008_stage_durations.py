@@ -0,0 +1,69 @@
+# Generated by Django 5.2 on 2026-10-19 08:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0007_timeline_user'),
+        ('applications', '0014_application_updated_idx'),
+        ('users', '0006_resumeblob_extraction'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicationmetrics',
+            name='response_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='applicationmetrics',
+            name='response_time_total',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='companyanalytics',
+            name='process_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='companyanalytics',
+            name='process_duration_total',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.CreateModel(
+            name='StageStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('total_seconds', models.FloatField(default=0.0)),
+                ('sketch', models.JSONField(default=dict)),
+                ('company', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stage_stats', to='users.companyprofile')),
+                ('user', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='stage_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'Stage Stats',
+                'constraints': [models.UniqueConstraint(condition=models.Q(('user__isnull', False)), fields=('user', 'stage'), name='stagestats_unique_user'), models.UniqueConstraint(condition=models.Q(('company__isnull', False)), fields=('company', 'stage'), name='stagestats_unique_company')],
+            },
+        ),
+        migrations.CreateModel(
+            name='StatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(max_length=20)),
+                ('to_status', models.CharField(max_length=20)),
+                ('changed_at', models.DateTimeField()),
+                ('stage_seconds', models.FloatField()),
+                ('application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_transitions', to='applications.application')),
+            ],
+            options={
+                'ordering': ['application', 'changed_at'],
+                'indexes': [models.Index(fields=['application', '-changed_at'], name='transition_app_changed_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.2 on 2026-10-19 08:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0008_stage_durations'),
+        ('jobs', '0002_alter_job_salary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('applications', models.IntegerField(default=0)),
+                ('status_changes', models.JSONField(default=dict)),
+                ('first_reviews', models.IntegerField(default=0)),
+                ('review_sketch', models.JSONField(default=dict)),
+                ('hires', models.IntegerField(default=0)),
+                ('hire_sketch', models.JSONField(default=dict)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.job')),
+            ],
+            options={
+                'verbose_name_plural': 'Job Daily Stats',
+                'ordering': ['job', 'day'],
+                'constraints': [models.UniqueConstraint(fields=('job', 'day'), name='jobdailystats_unique_day')],
+            },
+        ),
+    ]
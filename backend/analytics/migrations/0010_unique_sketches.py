@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 08:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0009_job_daily_stats'),
+        ('users', '0006_resumeblob_extraction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UniqueSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('registers', models.BinaryField()),
+                ('company', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='unique_sketches', to='users.companyprofile')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(condition=models.Q(('company__isnull', False)), fields=('company', 'day'), name='uniquesketch_unique_company'), models.UniqueConstraint(condition=models.Q(('company__isnull', True)), fields=('day',), name='uniquesketch_unique_platform')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-19 08:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0010_unique_sketches'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RetentionCohort',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('week', models.DateField(unique=True)),
+                ('size', models.IntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['week'],
+            },
+        ),
+        migrations.CreateModel(
+            name='CohortActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cohort_week', models.DateField()),
+                ('activity_week', models.DateField()),
+                ('active_users', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'Cohort Activity',
+                'ordering': ['cohort_week', 'activity_week'],
+                'constraints': [models.UniqueConstraint(fields=('cohort_week', 'activity_week'), name='cohortactivity_unique_weeks')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CohortMember',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cohort_week', models.DateField()),
+                ('last_active_week', models.DateField(null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='cohort_member', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
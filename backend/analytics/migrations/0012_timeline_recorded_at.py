@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-19 14:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0011_cohort_retention'),
+    ]
+
+    # Existing events count as recorded now, which caps them at the current week as rebuilds did before
+    operations = [
+        migrations.AddField(
+            model_name='applicationtimeline',
+            name='recorded_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='archivedapplicationtimeline',
+            name='recorded_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
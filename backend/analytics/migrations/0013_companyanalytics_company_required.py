@@ -0,0 +1,44 @@
+# Generated by Django 5.2 on 2026-10-19 14:40
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def link_company_rows(apps, schema_editor):
+    """
+    Link analytics rows that predate the rollup to their company by name, and drop the rest.
+
+    A name is only trusted when exactly one company has it and that company
+    has no row of its own yet; the rollup recomputes linked rows from source.
+    """
+    CompanyAnalytics = apps.get_model('analytics', 'CompanyAnalytics')
+    CompanyProfile = apps.get_model('users', 'CompanyProfile')
+    companies = defaultdict(list)
+    for pk, company_name in CompanyProfile.objects.values_list('pk', 'company_name'):
+        companies[company_name].append(pk)
+    linked = set(CompanyAnalytics.objects.filter(company__isnull=False).values_list('company_id', flat=True))
+    for pk, company_name in CompanyAnalytics.objects.filter(company__isnull=True).order_by('-last_updated', '-id').values_list('pk', 'company_name'):
+        matches = companies.get(company_name, [])
+        if len(matches) == 1 and matches[0] not in linked:
+            CompanyAnalytics.objects.filter(pk=pk).update(company_id=matches[0])
+            linked.add(matches[0])
+    CompanyAnalytics.objects.filter(company__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0012_timeline_recorded_at'),
+        ('users', '0006_resumeblob_extraction'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_company_rows, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='companyanalytics',
+            name='company',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='analytics', to='users.companyprofile'),
+        ),
+    ]
@@ -13,29 +13,190 @@ class ApplicationMetrics(models.Model):
     offers_received = models.IntegerField(default=0)
     rejections = models.IntegerField(default=0)
     average_response_time = models.FloatField(default=0.0)  # in days
+    # Running sum and count behind average_response_time
+    response_time_total = models.FloatField(default=0.0)  # in days
+    response_count = models.IntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Application Metrics"
+        constraints = [
+            models.UniqueConstraint(fields=['user'], name='appmetrics_unique_user'),
+        ]
 
 class ApplicationTimeline(models.Model):
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='timeline_events')
+    # Owner of the application (jobseeker.user), copied so the activity feed is one index range scan
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline_events', null=True, editable=False)
     event_type = models.CharField(max_length=50)  # e.g., 'submitted', 'interview_scheduled', 'offer_received'
     event_date = models.DateTimeField()
     notes = models.TextField(blank=True, null=True)
+    # When the event was written; an event dated ahead counts as activity in the week it was recorded
+    recorded_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         ordering = ['-event_date']
+        indexes = [
+            models.Index(fields=['user', '-event_date', '-id'], name='timeline_user_date_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        if self.user_id is None:
+            self.user_id = Application.objects.filter(pk=self.application_id).values_list(
+                'jobseeker__user_id', flat=True
+            ).first()
+        super().save(*args, **kwargs)
+
+class ArchivedApplicationTimeline(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    application_id = models.BigIntegerField(db_index=True)
+    event_type = models.CharField(max_length=50)
+    event_date = models.DateTimeField()
+    notes = models.TextField(blank=True, null=True)
+    recorded_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-event_date']
+
+class EventTrend(models.Model):
+    BUCKET_CHOICES = [
+        ('day', 'Day'),
+        ('week', 'Week'),  # starts on Monday
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='event_trends')
+    bucket = models.CharField(max_length=5, choices=BUCKET_CHOICES)
+    bucket_start = models.DateField()
+    event_type = models.CharField(max_length=50)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also serves trend reads: user, bucket, then a bucket_start range
+            models.UniqueConstraint(fields=['user', 'bucket', 'bucket_start', 'event_type'], name='eventtrend_unique_bucket'),
+        ]
 
 class CompanyAnalytics(models.Model):
+    # Written by analytics.rollups
+    company = models.OneToOneField('users.CompanyProfile', on_delete=models.CASCADE, related_name='analytics')
     company_name = models.CharField(max_length=255)
     total_applications = models.IntegerField(default=0)
     success_rate = models.FloatField(default=0.0)  # percentage
     average_process_duration = models.FloatField(default=0.0)  # in days
+    # Running sum and count behind average_process_duration
+    process_duration_total = models.FloatField(default=0.0)  # in days
+    process_count = models.IntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name_plural = "Company Analytics"
+        indexes = [
+            models.Index(fields=['total_applications'], name='companyanalytics_total_idx'),
+            models.Index(fields=['success_rate'], name='companyanalytics_success_idx'),
+        ]
+
+class StatusTransition(models.Model):
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_transitions')
+    from_status = models.CharField(max_length=20)
+    to_status = models.CharField(max_length=20)
+    changed_at = models.DateTimeField()
+    # Time the application spent in from_status
+    stage_seconds = models.FloatField()
+
+    class Meta:
+        ordering = ['application', 'changed_at']
+        indexes = [
+            models.Index(fields=['application', '-changed_at'], name='transition_app_changed_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+class StageStats(models.Model):
+    # Exactly one of user (candidate view) and company (recruiter view) is set
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='stage_stats', null=True)
+    company = models.ForeignKey('users.CompanyProfile', on_delete=models.CASCADE, related_name='stage_stats', null=True)
+    stage = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+    total_seconds = models.FloatField(default=0.0)
+    # Log-bucket histogram for percentiles; see analytics.sketches.QuantileSketch
+    sketch = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name_plural = "Stage Stats"
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'stage'], condition=models.Q(user__isnull=False), name='stagestats_unique_user'),
+            models.UniqueConstraint(fields=['company', 'stage'], condition=models.Q(company__isnull=False), name='stagestats_unique_company'),
+        ]
+
+class JobDailyStats(models.Model):
+    job = models.ForeignKey('jobs.Job', on_delete=models.CASCADE, related_name='daily_stats')
+    day = models.DateField()
+    applications = models.IntegerField(default=0)
+    # Net change of each status count on this day; summed over all days it is the current distribution
+    status_changes = models.JSONField(default=dict)
+    # Seconds from applying to the first move out of 'New' and into 'Hired', for moves made on this day;
+    # see analytics.sketches.QuantileSketch
+    first_reviews = models.IntegerField(default=0)
+    review_sketch = models.JSONField(default=dict)
+    hires = models.IntegerField(default=0)
+    hire_sketch = models.JSONField(default=dict)
+
+    class Meta:
+        verbose_name_plural = "Job Daily Stats"
+        ordering = ['job', 'day']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'day'], name='jobdailystats_unique_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} on {self.day}"
+
+class UniqueSketch(models.Model):
+    # Distinct job seekers who applied on a day: to one company, or anywhere on the platform (company null)
+    company = models.ForeignKey('users.CompanyProfile', on_delete=models.CASCADE, related_name='unique_sketches', null=True)
+    day = models.DateField()
+    # Serialized analytics.sketches.HyperLogLog
+    registers = models.BinaryField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'day'], condition=models.Q(company__isnull=False), name='uniquesketch_unique_company'),
+            models.UniqueConstraint(fields=['day'], condition=models.Q(company__isnull=True), name='uniquesketch_unique_platform'),
+        ]
+
+class RetentionCohort(models.Model):
+    # Job seekers who registered in the week starting on this Monday
+    week = models.DateField(unique=True)
+    size = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['week']
+
+class CohortMember(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='cohort_member')
+    cohort_week = models.DateField()
+    # Latest week the job seeker was counted active in, so each week is counted once
+    last_active_week = models.DateField(null=True)
+
+class CohortActivity(models.Model):
+    cohort_week = models.DateField()
+    activity_week = models.DateField()
+    active_users = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "Cohort Activity"
+        ordering = ['cohort_week', 'activity_week']
+        constraints = [
+            models.UniqueConstraint(fields=['cohort_week', 'activity_week'], name='cohortactivity_unique_weeks'),
+        ]
+
+class RollupCheckpoint(models.Model):
+    name = models.CharField(max_length=50, unique=True)  # e.g. 'company_analytics'
+    last_run_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} at {self.last_run_at}"
 
 class InterviewQuestion(models.Model):
     QUESTION_TYPE_CHOICES = [
@@ -0,0 +1,126 @@
+# analytics/rollups.py
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, OuterRef, Q, Subquery, Sum
+from django.utils import timezone
+
+from applications.archive import archived_with_transitions
+from applications.models import Application, ArchivedApplication
+from users.models import CompanyProfile
+from .models import CompanyAnalytics, RollupCheckpoint, StatusTransition
+from .stages import DECIDED_STATUSES
+
+COMPANY_ROLLUP = 'company_analytics'
+SUCCESS_STATUSES = ['Offer', 'Hired']
+# Re-scan a little before the last run so transactions still open during it are not missed
+CHECKPOINT_OVERLAP = timedelta(minutes=5)
+
+
+def touched_companies(since):
+    """Companies with an application created or changed since the given time."""
+    return set(
+        Application.objects.filter(updated_at__gte=since)
+        .order_by().values_list('job__company_id', flat=True).distinct()
+    )
+
+
+def rollup_companies(company_ids):
+    """
+    Recompute CompanyAnalytics for a batch of companies.
+
+    One grouped query over the applications of the batch, one over their
+    archived applications and one upsert. The process duration of an
+    application runs from its creation to its first recorded move into a
+    decided status; archived ones read it from their history.
+    """
+    first_decision = StatusTransition.objects.filter(
+        application=OuterRef('pk'), to_status__in=DECIDED_STATUSES
+    ).order_by('changed_at').values('changed_at')[:1]
+    duration = ExpressionWrapper(Subquery(first_decision) - F('created_at'), output_field=DurationField())
+    stats = {
+        row['job__company_id']: row
+        for row in Application.objects.filter(job__company_id__in=company_ids)
+        .order_by().values('job__company_id').annotate(
+            total=Count('id'),
+            successes=Count('id', filter=Q(status__in=SUCCESS_STATUSES)),
+            duration_total=Sum(duration),
+            decided=Count(duration),
+        )
+    }
+
+    archived = {
+        row['job__company_id']: row
+        for row in ArchivedApplication.objects.filter(job__company_id__in=company_ids)
+        .order_by().values('job__company_id').annotate(
+            total=Count('id'),
+            successes=Count('id', filter=Q(status__in=SUCCESS_STATUSES)),
+        )
+    }
+    archived_durations = defaultdict(list)
+    for company_id, created_at, transitions in archived_with_transitions(
+        ArchivedApplication.objects.filter(job__company_id__in=company_ids), 'job__company_id', 'created_at'
+    ):
+        decision = next((t['changed_at'] for t in transitions if t['to_status'] in DECIDED_STATUSES), None)
+        if decision is not None:
+            archived_durations[company_id].append((decision - created_at).total_seconds() / 86400)
+
+    now = timezone.now()
+    rows = []
+    for company_id, company_name in CompanyProfile.objects.filter(pk__in=company_ids).values_list('pk', 'company_name'):
+        row = stats.get(company_id, {})
+        archived_row = archived.get(company_id, {})
+        total = row.get('total', 0) + archived_row.get('total', 0)
+        successes = row.get('successes', 0) + archived_row.get('successes', 0)
+        decided = row.get('decided', 0) + len(archived_durations[company_id])
+        duration_days = row['duration_total'].total_seconds() / 86400 if row.get('duration_total') else 0.0
+        duration_days += sum(archived_durations[company_id])
+        rows.append(CompanyAnalytics(
+            company_id=company_id,
+            company_name=company_name,
+            total_applications=total,
+            success_rate=round(successes / total * 100, 2) if total else 0.0,
+            process_duration_total=duration_days,
+            process_count=decided,
+            average_process_duration=duration_days / decided if decided else 0.0,
+            last_updated=now,
+        ))
+    CompanyAnalytics.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['company'],
+        update_fields=[
+            'company_name', 'total_applications', 'success_rate', 'process_duration_total',
+            'process_count', 'average_process_duration', 'last_updated',
+        ],
+    )
+    return len(rows)
+
+
+def run_company_rollup(full=False, batch_size=500, stdout=None):
+    """
+    Bring CompanyAnalytics up to date.
+
+    Incremental runs only recompute companies whose applications changed since
+    the previous run. Deleted applications leave no trace to detect, so a
+    periodic ``full`` run recomputes every company.
+
+    Returns:
+        The number of companies recomputed
+    """
+    started = timezone.now()
+    checkpoint = RollupCheckpoint.objects.filter(name=COMPANY_ROLLUP).first()
+    if full or checkpoint is None:
+        company_ids = list(CompanyProfile.objects.order_by('pk').values_list('pk', flat=True))
+    else:
+        company_ids = sorted(touched_companies(checkpoint.last_run_at - CHECKPOINT_OVERLAP))
+
+    for start in range(0, len(company_ids), batch_size):
+        with transaction.atomic():
+            rollup_companies(company_ids[start:start + batch_size])
+        if stdout is not None:
+            stdout.write(f"Rolled up {min(start + batch_size, len(company_ids))} of {len(company_ids)} companies")
+
+    RollupCheckpoint.objects.update_or_create(name=COMPANY_ROLLUP, defaults={'last_run_at': started})
+    return len(company_ids)
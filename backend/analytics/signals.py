@@ -0,0 +1,52 @@
+# analytics/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from django.contrib.auth import get_user_model
+
+from applications.archive import archiving
+from applications.models import Application
+from . import cohorts, funnel, job_stats, metrics, stages, trends, uniques
+from .models import ApplicationTimeline
+
+
+@receiver(post_save, sender=Application)
+def update_application_metrics(sender, instance, created, **kwargs):
+    """Keep the candidate's dashboard counters in step with the application's status, and record transitions."""
+    previous_status = getattr(instance, '_loaded_status', None)
+    if created:
+        metrics.record_created([instance])
+        job_stats.record_applied([instance])
+        uniques.record_applied([instance])
+        cohorts.record_applied([instance])
+        funnel.invalidate_funnels([instance.jobseeker_id], [instance.job_id])
+    elif previous_status is not None and previous_status != instance.status:
+        metrics.record_status_change(instance, previous_status)
+        stages.record_transition(instance, previous_status)
+        funnel.invalidate_funnels([instance.jobseeker_id], [instance.job_id])
+    instance._loaded_status = instance.status
+
+
+@receiver(post_delete, sender=Application)
+def remove_application_metrics(sender, instance, **kwargs):
+    """Take a deleted application out of its candidate's counters and job stats; archiving leaves them as they are."""
+    funnel.invalidate_funnels([instance.jobseeker_id], [instance.job_id])
+    if archiving.get():
+        return
+    metrics.record_deleted(instance)
+    job_stats.record_deleted(instance)
+
+
+@receiver(post_save, sender=ApplicationTimeline)
+def count_timeline_event(sender, instance, created, **kwargs):
+    """Add a new timeline event to its owner's trend buckets and cohort activity."""
+    if created:
+        trends.record_events([instance])
+        cohorts.record_activity([(instance.user_id, min(instance.event_date, instance.recorded_at))])
+
+
+@receiver(post_save, sender=get_user_model())
+def join_retention_cohort(sender, instance, created, **kwargs):
+    """Add a newly registered job seeker to the retention cohort of their registration week."""
+    if created and instance.user_type == 'jobseeker':
+        cohorts.join_cohort(instance.pk, instance.date_joined)
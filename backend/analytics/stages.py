@@ -0,0 +1,114 @@
+# analytics/stages.py
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from applications.models import Application
+from . import job_stats
+from .models import ApplicationMetrics, CompanyAnalytics, StageStats, StatusTransition
+from .sketches import QuantileSketch
+
+# Reaching one of these ends the hiring process for an application
+DECIDED_STATUSES = ['Offer', 'Hired', 'Rejected']
+SECONDS_PER_DAY = 86400
+PERCENTILES = {'p50': 0.5, 'p90': 0.9}
+
+
+def observe_stage(lookup, stage, seconds):
+    """Add one stage duration to a StageStats row: running count, sum and sketch."""
+    with transaction.atomic():
+        stats, _ = StageStats.objects.select_for_update().get_or_create(stage=stage, **lookup)
+        sketch = QuantileSketch(stats.sketch)
+        sketch.add(seconds)
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.sketch = sketch.to_json()
+        stats.save(update_fields=['count', 'total_seconds', 'sketch'])
+
+
+def add_to_average(model, lookup, total_field, count_field, average_field, days):
+    """
+    Fold one observation into a running average with a single UPDATE.
+
+    SET reads the old column values, so the new average is (total + days) / (count + 1).
+    Missing rows are left to the source rebuilds, which include every transition.
+    """
+    model.objects.filter(**lookup).update(**{
+        total_field: F(total_field) + days,
+        count_field: F(count_field) + 1,
+        average_field: (F(total_field) + days) / (F(count_field) + 1),
+    })
+
+
+def record_transition(application, previous_status, changed_at=None):
+    """
+    Record a status change and fold its durations into the running statistics.
+
+    Costs a fixed number of queries whatever the history size: the previous
+    transition, the owner and company, one insert, and one update per statistic.
+
+    - The time spent in ``previous_status`` goes into the candidate's and the
+      company's StageStats.
+    - The first move out of 'New' is the company's response; it feeds the
+      candidate's average_response_time.
+    - The first move into a decided status ends the process; it feeds the
+      company's average_process_duration.
+    - The job's day row gets the status change, and the time to first review
+      or to hire when this is one.
+    """
+    changed_at = changed_at or timezone.now()
+    history = StatusTransition.objects.filter(application_id=application.pk)
+    last_change = history.order_by('-changed_at', '-id').values_list('changed_at', flat=True).first()
+    first_decision = application.status in DECIDED_STATUSES and not history.filter(
+        to_status__in=DECIDED_STATUSES
+    ).exists()
+    first_hire = application.status == job_stats.HIRED and not history.filter(to_status=job_stats.HIRED).exists()
+    entered_at = last_change or application.created_at
+    stage_seconds = max((changed_at - entered_at).total_seconds(), 0.0)
+
+    StatusTransition.objects.create(
+        application_id=application.pk,
+        from_status=previous_status,
+        to_status=application.status,
+        changed_at=changed_at,
+        stage_seconds=stage_seconds,
+    )
+
+    user_id, company_id = Application.objects.filter(pk=application.pk).values_list(
+        'jobseeker__user_id', 'job__company_id'
+    ).first()
+    observe_stage({'user_id': user_id, 'company': None}, previous_status, stage_seconds)
+    observe_stage({'company_id': company_id, 'user': None}, previous_status, stage_seconds)
+
+    elapsed_days = max((changed_at - application.created_at).total_seconds(), 0.0) / SECONDS_PER_DAY
+    if last_change is None and previous_status == 'New':
+        add_to_average(
+            ApplicationMetrics, {'user_id': user_id},
+            'response_time_total', 'response_count', 'average_response_time', elapsed_days
+        )
+    if first_decision:
+        add_to_average(
+            CompanyAnalytics, {'company_id': company_id},
+            'process_duration_total', 'process_count', 'average_process_duration', elapsed_days
+        )
+    job_stats.record_status_change(
+        application, previous_status, changed_at,
+        first_review=last_change is None and previous_status == 'New', first_hire=first_hire,
+    )
+
+
+def stage_summary(lookup):
+    """Per-stage count, average and percentiles in days for one candidate or company."""
+    summary = []
+    for stats in StageStats.objects.filter(**lookup).order_by('stage'):
+        sketch = QuantileSketch(stats.sketch)
+        row = {
+            'stage': stats.stage,
+            'count': stats.count,
+            'average_days': round(stats.total_seconds / stats.count / SECONDS_PER_DAY, 2) if stats.count else None,
+        }
+        for name, q in PERCENTILES.items():
+            value = sketch.quantile(q)
+            row[f'{name}_days'] = round(value / SECONDS_PER_DAY, 2) if value is not None else None
+        summary.append(row)
+    return summary
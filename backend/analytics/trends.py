@@ -0,0 +1,162 @@
+# analytics/trends.py
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+
+from applications.models import Application, ArchivedApplication
+from users.models import JobSeekerProfile
+from .counters import increment
+from .models import ApplicationTimeline, ArchivedApplicationTimeline, EventTrend
+
+BUCKETS = ['day', 'week', 'month']
+# Default span of each bucket size, in days
+DEFAULT_RANGE_DAYS = {'day': 30, 'week': 7 * 12, 'month': 365}
+BUCKET_DAYS = {'day': 1, 'week': 7, 'month': 30}
+RANGE_UNITS = {'d': 1, 'w': 7, 'm': 30, 'y': 365}
+MAX_RANGE_DAYS = 366 * 5
+
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def bucket_starts(day):
+    """The stored buckets a day falls into; months are summed from days at read time."""
+    return {'day': day, 'week': week_start(day)}
+
+
+def record_events(events):
+    """
+    Count timeline events in their owners' day and week buckets.
+
+    Called for every timeline event as it is written: from post_save for single
+    events and explicitly after bulk_create. Events are grouped first, so a
+    batch costs one owner lookup plus one upsert per touched bucket.
+    """
+    events = list(events)
+    if not events:
+        return
+    owners = dict(
+        Application.objects.filter(pk__in={event.application_id for event in events if event.user_id is None})
+        .values_list('pk', 'jobseeker__user_id')
+    )
+    counts = Counter()
+    for event in events:
+        user_id = event.user_id or owners.get(event.application_id)
+        if user_id is None:
+            continue
+        for bucket, start in bucket_starts(timezone.localtime(event.event_date).date()).items():
+            counts[(user_id, bucket, start, event.event_type)] += 1
+    for (user_id, bucket, start, event_type), count in counts.items():
+        increment(
+            EventTrend,
+            {'user_id': user_id, 'bucket': bucket, 'bucket_start': start, 'event_type': event_type},
+            count=count,
+        )
+
+
+def range_start(today, bucket, range_param=None):
+    """
+    First day of a trend window ending today, aligned to the bucket size.
+
+    Args:
+        today: Last day of the window
+        bucket: 'day', 'week' or 'month'
+        range_param: A span such as '30d', '12w', '6m' or '1y', or a plain number of buckets
+
+    Raises:
+        ValueError: If range_param cannot be parsed
+    """
+    if not range_param:
+        days = DEFAULT_RANGE_DAYS[bucket]
+    elif range_param[-1] in RANGE_UNITS:
+        days = int(range_param[:-1]) * RANGE_UNITS[range_param[-1]]
+    else:
+        days = int(range_param) * BUCKET_DAYS[bucket]
+    if days < 1:
+        raise ValueError("range must be positive")
+    start = today - timedelta(days=min(days, MAX_RANGE_DAYS) - 1)
+    if bucket == 'week':
+        start = week_start(start)
+    elif bucket == 'month':
+        start = start.replace(day=1)
+    return start
+
+
+def trend_series(user, bucket='day', range_param=None):
+    """Event counts per bucket and event type, read from the pre-summed EventTrend rows."""
+    start = range_start(timezone.localdate(), bucket, range_param)
+    if bucket == 'month':
+        rows = (
+            EventTrend.objects.filter(user=user, bucket='day', bucket_start__gte=start)
+            .annotate(event_date=TruncMonth('bucket_start'))
+            .values('event_date', 'event_type')
+            .annotate(count=Sum('count'))
+        )
+    else:
+        rows = (
+            EventTrend.objects.filter(user=user, bucket=bucket, bucket_start__gte=start)
+            .values('event_type', 'count', event_date=F('bucket_start'))
+        )
+    return list(rows.order_by('event_date', 'event_type'))
+
+
+def rebuild_trends(batch_size=500, stdout=None):
+    """
+    Recompute EventTrend from live and archived timeline events, in batches of job seekers.
+
+    Returns:
+        The number of job seekers processed
+    """
+    last_pk = 0
+    total = 0
+    while True:
+        profiles = list(
+            JobSeekerProfile.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', 'user_id')[:batch_size]
+        )
+        if not profiles:
+            break
+        jobseeker_ids = [pk for pk, _ in profiles]
+        user_ids = [user_id for _, user_id in profiles]
+
+        daily = Counter()
+        for row in (
+            ApplicationTimeline.objects.filter(application__jobseeker_id__in=jobseeker_ids)
+            .annotate(day=TruncDate('event_date'))
+            .order_by().values('application__jobseeker__user_id', 'day', 'event_type')
+            .annotate(count=Count('id'))
+        ):
+            daily[(row['application__jobseeker__user_id'], row['day'], row['event_type'])] += row['count']
+
+        archived_owners = dict(
+            ArchivedApplication.objects.filter(jobseeker_id__in=jobseeker_ids).values_list('pk', 'jobseeker__user_id')
+        )
+        for row in (
+            ArchivedApplicationTimeline.objects.filter(application_id__in=list(archived_owners))
+            .annotate(day=TruncDate('event_date'))
+            .order_by().values('application_id', 'day', 'event_type')
+            .annotate(count=Count('id'))
+        ):
+            daily[(archived_owners[row['application_id']], row['day'], row['event_type'])] += row['count']
+
+        buckets = Counter()
+        for (user_id, day, event_type), count in daily.items():
+            for bucket, start in bucket_starts(day).items():
+                buckets[(user_id, bucket, start, event_type)] += count
+
+        with transaction.atomic():
+            EventTrend.objects.filter(user_id__in=user_ids).delete()
+            EventTrend.objects.bulk_create([
+                EventTrend(user_id=user_id, bucket=bucket, bucket_start=start, event_type=event_type, count=count)
+                for (user_id, bucket, start, event_type), count in buckets.items()
+            ], batch_size=1000)
+
+        total += len(profiles)
+        last_pk = profiles[-1][0]
+        if stdout is not None:
+            stdout.write(f"Rebuilt trends for {total} job seekers (last profile id {last_pk})")
+    return total
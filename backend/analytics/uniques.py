@@ -0,0 +1,111 @@
+# analytics/uniques.py
+from collections import defaultdict
+
+from django.db import transaction
+
+from applications.models import Application, ArchivedApplication
+from jobs.models import Job
+from .job_stats import local_day
+from .models import UniqueSketch
+from .sketches import HyperLogLog
+
+
+def add_to_sketch(company_id, day, jobseeker_ids):
+    """
+    Add job seekers to a day sketch (company_id None for the platform one).
+
+    Once a sketch holds more than a few hundred values most additions leave
+    every register as it was, so the common case is one unlocked read and no
+    write. Changes are merged under a row lock; merging is idempotent, so a
+    value added twice is still counted once.
+    """
+    lookup = {'company_id': company_id, 'day': day}
+    current = UniqueSketch.objects.filter(**lookup).values_list('registers', flat=True).first()
+    if current is not None and not HyperLogLog(current).would_change(jobseeker_ids):
+        return
+    with transaction.atomic():
+        row, _ = UniqueSketch.objects.select_for_update().get_or_create(
+            **lookup, defaults={'registers': HyperLogLog().to_bytes()}
+        )
+        sketch = HyperLogLog(row.registers)
+        for jobseeker_id in jobseeker_ids:
+            sketch.add(jobseeker_id)
+        row.registers = sketch.to_bytes()
+        row.save(update_fields=['registers'])
+
+
+def record_applied(applications, companies=None):
+    """
+    Add the applicants of new applications to their company and platform day sketches.
+
+    Args:
+        companies: {job_id: company_id}, looked up when not given
+    """
+    if companies is None:
+        companies = dict(
+            Job.objects.filter(pk__in={application.job_id for application in applications})
+            .values_list('pk', 'company_id')
+        )
+    groups = defaultdict(set)
+    for application in applications:
+        day = local_day(application.created_at)
+        groups[(companies[application.job_id], day)].add(application.jobseeker_id)
+        groups[(None, day)].add(application.jobseeker_id)
+    for (company_id, day), jobseeker_ids in groups.items():
+        add_to_sketch(company_id, day, jobseeker_ids)
+
+
+def unique_job_seekers(start, end, company_id=None):
+    """Estimated distinct job seekers who applied between two days (inclusive), to one company or anywhere."""
+    merged = HyperLogLog()
+    for registers in UniqueSketch.objects.filter(
+        company_id=company_id, day__gte=start, day__lte=end
+    ).values_list('registers', flat=True):
+        merged.merge(HyperLogLog(registers))
+    return merged.estimate()
+
+
+def rebuild_unique_sketches(since=None, stdout=None):
+    """
+    Recompute the day sketches from live and archived applications.
+
+    Each source is read once in creation order through a server-side cursor
+    and flushed a day at a time, so memory holds a single day of applicants.
+    Counts read while this runs are low for the days not yet rebuilt.
+
+    Args:
+        since: First day to rebuild; every day when None
+
+    Returns:
+        The number of days rebuilt
+    """
+    sketches = UniqueSketch.objects.all()
+    if since is not None:
+        sketches = sketches.filter(day__gte=since)
+    sketches.delete()
+
+    for model in (Application, ArchivedApplication):
+        queryset = model.objects.order_by('created_at')
+        if since is not None:
+            queryset = queryset.filter(created_at__date__gte=since)
+        current_day, groups = None, defaultdict(set)
+        for company_id, created_at, jobseeker_id in queryset.values_list(
+            'job__company_id', 'created_at', 'jobseeker_id'
+        ).iterator(chunk_size=5000):
+            day = local_day(created_at)
+            if day != current_day and groups:
+                flush_day(current_day, groups)
+                groups = defaultdict(set)
+            current_day = day
+            groups[company_id].add(jobseeker_id)
+            groups[None].add(jobseeker_id)
+        if groups:
+            flush_day(current_day, groups)
+        if stdout is not None:
+            stdout.write(f"Rebuilt sketches from {model._meta.verbose_name_plural}")
+    return sketches.filter(company__isnull=True).count()
+
+
+def flush_day(day, groups):
+    for company_id, jobseeker_ids in groups.items():
+        add_to_sketch(company_id, day, jobseeker_ids)
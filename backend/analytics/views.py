@@ -1,10 +1,20 @@
 from django.shortcuts import render
-from rest_framework import viewsets, permissions
+from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db.models import Count, Avg
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.http import StreamingHttpResponse
 from datetime import timedelta
+from .metrics import get_metrics
+from .trends import BUCKETS, trend_series
+from .stages import stage_summary
+from .funnel import get_cached_funnel, summarize
+from .export import ExportUnavailable, TableExport
+from .sketches import HyperLogLog
+from .uniques import unique_job_seekers
+from .cohorts import DEFAULT_COHORTS, MAX_COHORTS, RETENTION_WEEKS, retention_table
 from .models import ApplicationMetrics, ApplicationTimeline, CompanyAnalytics
 from applications.models import InterviewQuestion, PracticeAnswer
 from .serializers import (
@@ -15,79 +25,185 @@ from .serializers import (
     PracticeAnswerSerializer
 )
 from applications.models import Application
-from config.utils import StandardResultsSetPagination
+from users.models import CompanyProfile
+from config.utils import StandardResultsSetPagination, StandardCursorPagination, atomic_stream
 
 # Create your views here.
 
+class TimelineCursorPagination(StandardCursorPagination):
+    # Matches the (user, event_date DESC, id DESC) index
+    ordering = ('-event_date', '-id')
+
+COMPANY_STATS_ORDERING = ['company_name', 'total_applications', 'success_rate', 'average_process_duration']
+
 class AnalyticsViewSet(viewsets.ViewSet):
     permission_classes = [permissions.IsAuthenticated]
 
     @action(detail=False, methods=['GET'])
     def dashboard_metrics(self, request):
-        user = request.user
-        from applications.models import Application
-
-        # Get the jobseeker profile for this user
-        jobseeker_profile = getattr(user, 'jobseeker_profile', None)
-        print("DEBUG: user =", user)
-        print("DEBUG: jobseeker_profile =", jobseeker_profile)
-
-        applications = Application.objects.filter(jobseeker=jobseeker_profile) if jobseeker_profile else Application.objects.none()
-        print("DEBUG: applications =", list(applications.values('id', 'status')))
-
-        total_applications = applications.count()
-        applications_in_progress = applications.filter(status__in=['New', 'Under Review', 'Shortlisted']).count()
-        interviews_scheduled = applications.filter(status='Interviewed').count()
-        offers_received = applications.filter(status='Offer').count()
-        rejections = applications.filter(status='Rejected').count()
-
-        metrics, created = ApplicationMetrics.objects.get_or_create(user=user)
-        metrics.total_applications = total_applications
-        metrics.applications_in_progress = applications_in_progress
-        metrics.interviews_scheduled = interviews_scheduled
-        metrics.offers_received = offers_received
-        metrics.rejections = rejections
-        metrics.save()
-
-        serializer = ApplicationMetricsSerializer(metrics)
+        # Counters are maintained by analytics.signals; reading never writes
+        serializer = ApplicationMetricsSerializer(get_metrics(request.user))
         return Response(serializer.data)
 
     @action(detail=False, methods=['GET'])
     def application_timeline(self, request):
-        user = request.user
-        timeline = ApplicationTimeline.objects.filter(
-            application__user=user
-        ).order_by('-event_date')
-        serializer = ApplicationTimelineSerializer(timeline, many=True)
-        return Response(serializer.data)
+        # Newest first with keyset pagination; ?since=<ISO datetime> returns only newer events
+        timeline = ApplicationTimeline.objects.filter(user=request.user)
+        since = request.query_params.get('since')
+        if since:
+            since_date = parse_datetime(since)
+            if since_date is None:
+                return Response({'error': "since must be an ISO 8601 datetime"}, status=status.HTTP_400_BAD_REQUEST)
+            if timezone.is_naive(since_date):
+                since_date = timezone.make_aware(since_date)
+            timeline = timeline.filter(event_date__gt=since_date)
+
+        paginator = TimelineCursorPagination()
+        page = paginator.paginate_queryset(timeline, request, view=self)
+        serializer = ApplicationTimelineSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['GET'])
     def company_stats(self, request):
-        companies = CompanyAnalytics.objects.all()
-        serializer = CompanyAnalyticsSerializer(companies, many=True)
-        return Response(serializer.data)
+        # Rows are written by `manage.py rollup_company_analytics`
+        ordering = request.query_params.get('ordering', '-total_applications')
+        if ordering.lstrip('-') not in COMPANY_STATS_ORDERING:
+            ordering = '-total_applications'
+        companies = CompanyAnalytics.objects.order_by(ordering, 'id')
+
+        paginator = StandardResultsSetPagination()
+        page = paginator.paginate_queryset(companies, request, view=self)
+        serializer = CompanyAnalyticsSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['GET'])
     def trend_analysis(self, request):
-        user = request.user
-        from applications.models import Application
-        jobseeker_profile = getattr(user, 'jobseeker_profile', None)
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=30)
+        # ?bucket=day|week|month&range=30d|12w|6m|1y (or a number of buckets)
+        bucket = request.query_params.get('bucket', 'day')
+        if bucket not in BUCKETS:
+            return Response({'error': f"bucket must be one of: {', '.join(BUCKETS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            series = trend_series(request.user, bucket, request.query_params.get('range'))
+        except ValueError:
+            return Response({'error': "range must look like 30d, 12w, 6m, 1y or a number of buckets"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(series)
+
+    @action(detail=False, methods=['GET'])
+    def stage_durations(self, request):
+        # Time spent per status, from running sums and sketches: O(stages) to read.
+        # ?company=<id> reads a company's published figures; otherwise the caller's own.
+        company_id = request.query_params.get('company')
+        if company_id is None and getattr(request.user, 'user_type', None) == 'company':
+            company_id = CompanyProfile.objects.filter(user=request.user).values_list('pk', flat=True).first()
+        if company_id is not None:
+            try:
+                company_id = int(company_id)
+            except ValueError:
+                return Response({'error': "company must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+            analytics = CompanyAnalytics.objects.filter(company_id=company_id).first()
+            return Response({
+                'company': company_id,
+                'average_process_duration': analytics.average_process_duration if analytics else None,
+                'stages': stage_summary({'company_id': company_id}),
+            })
+        return Response({
+            'average_response_time': get_metrics(request.user).average_response_time,
+            'stages': stage_summary({'user': request.user}),
+        })
+
+    @action(detail=False, methods=['GET'])
+    def funnel(self, request):
+        # Share of applications that reached each stage, counting history and not just the current status.
+        # Companies get their funnel with one per job (?job=<id> narrows it); job seekers get their own.
+        company = CompanyProfile.objects.filter(user=request.user).first()
+        if company is not None:
+            applications = Application.objects.filter(job__company=company)
+            job_id = request.query_params.get('job')
+            if job_id:
+                if not job_id.isdigit():
+                    return Response({'error': "job must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+                applications = applications.filter(job_id=job_id)
+            return Response(get_cached_funnel(
+                'company', company.pk, applications, by_job=True, variant=job_id or 'all'
+            ))
 
-        timeline_data = ApplicationTimeline.objects.filter(
-            application__jobseeker=jobseeker_profile,
-            event_date__range=(start_date, end_date)
-        ).values('event_date', 'event_type').annotate(
-            count=Count('id')
-        ).order_by('event_date')
+        jobseeker_profile = getattr(request.user, 'jobseeker_profile', None)
+        if jobseeker_profile is None:
+            return Response(summarize({}))
+        return Response(get_cached_funnel(
+            'jobseeker', jobseeker_profile.pk, Application.objects.filter(jobseeker=jobseeker_profile)
+        ))
 
-        return Response(timeline_data)
+    @action(detail=False, methods=['GET'], permission_classes=[permissions.IsAdminUser])
+    def export(self, request):
+        # Streams one table as Parquet (default) or Arrow: ?table=applications&file_format=arrow&since=&until=&company=
+        # (DRF reserves ?format= for renderer selection)
+        params = request.query_params
+        filters = {}
+        for name in ('since', 'until'):
+            if params.get(name):
+                try:
+                    filters[name] = parse_date(params[name])
+                except ValueError:
+                    filters[name] = None
+                if filters[name] is None:
+                    return Response({'error': f"{name} must be a date (YYYY-MM-DD)"}, status=status.HTTP_400_BAD_REQUEST)
+        if params.get('company'):
+            if not params['company'].isdigit():
+                return Response({'error': "company must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+            filters['company_id'] = int(params['company'])
+        try:
+            export = TableExport(params.get('table', 'applications'), params.get('file_format', 'parquet'), **filters)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except ExportUnavailable as e:
+            return Response({'error': str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        response = StreamingHttpResponse(atomic_stream(export.chunks()), content_type=export.content_type)
+        response['Content-Disposition'] = f'attachment; filename="{export.filename}"'
+        return response
+
+    @action(detail=False, methods=['GET'], permission_classes=[permissions.IsAdminUser])
+    def unique_job_seekers(self, request):
+        # Estimated distinct applicants between two days, platform-wide or to one company (?company=<id>);
+        # merged from HyperLogLog day sketches, within about 1-2%
+        params = request.query_params
+        today = timezone.localdate()
+        error = Response({'error': "start and end must be dates (YYYY-MM-DD), start first"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            end = parse_date(params['end']) if params.get('end') else today
+            if end is None:
+                return error
+            start = parse_date(params['start']) if params.get('start') else end - timedelta(days=29)
+        except ValueError:
+            return error
+        if start is None or start > end:
+            return error
+        company_id = params.get('company')
+        if company_id and not company_id.isdigit():
+            return Response({'error': "company must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        company_id = int(company_id) if company_id else None
+        return Response({
+            'company': company_id,
+            'start': start,
+            'end': end,
+            'unique_job_seekers': unique_job_seekers(start, end, company_id),
+            'relative_error': round(HyperLogLog().relative_error, 4),
+        })
+
+    @action(detail=False, methods=['GET'], permission_classes=[permissions.IsAdminUser])
+    def cohorts(self, request):
+        # Weekly registration cohorts of job seekers and how many are still active each week after (?cohorts=12)
+        cohorts = request.query_params.get('cohorts', str(DEFAULT_COHORTS))
+        if not cohorts.isdigit() or not 1 <= int(cohorts) <= MAX_COHORTS:
+            return Response({'error': f"cohorts must be between 1 and {MAX_COHORTS}"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response({
+            'retention_weeks': RETENTION_WEEKS,
+            'cohorts': retention_table(int(cohorts)),
+        })
 
     @action(detail=False, methods=['GET'])
     def success_rate(self, request):
-        user = request.user
-        total = ApplicationMetrics.objects.get(user=user)
+        total = get_metrics(request.user)
         
         if total.total_applications > 0:
             success_rate = (total.offers_received / total.total_applications) * 100
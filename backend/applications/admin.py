@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Application, ApplicationNote, Interview, InterviewQuestion, PracticeAnswer
+from .models import Application, ApplicationNote, Interview, InterviewQuestion, PracticeAnswer, CalendarFeed, ArchivedApplication, QueuedApplication
 
 
 @admin.register(Application)
@@ -12,6 +12,25 @@ class ApplicationAdmin(admin.ModelAdmin):
     date_hierarchy = 'created_at'
 
 
+@admin.register(ArchivedApplication)
+class ArchivedApplicationAdmin(admin.ModelAdmin):
+    """Admin for ArchivedApplication model."""
+    
+    list_display = ('id', 'jobseeker', 'job', 'status', 'created_at', 'archived_at')
+    search_fields = ('jobseeker__full_name', 'job__title', 'job__company__company_name')
+    list_filter = ('status', 'archived_at')
+
+
+@admin.register(QueuedApplication)
+class QueuedApplicationAdmin(admin.ModelAdmin):
+    """Admin for QueuedApplication model."""
+    
+    list_display = ('tracking_id', 'jobseeker', 'job', 'status', 'created_at', 'processed_at')
+    search_fields = ('tracking_id', 'jobseeker__full_name', 'job__title')
+    list_filter = ('status', 'created_at')
+    readonly_fields = ('tracking_id',)
+
+
 @admin.register(ApplicationNote)
 class ApplicationNoteAdmin(admin.ModelAdmin):
     """Admin for ApplicationNote model."""
@@ -37,5 +56,14 @@ class InterviewAdmin(admin.ModelAdmin):
     date_hierarchy = 'scheduled_at'
 
 
+@admin.register(CalendarFeed)
+class CalendarFeedAdmin(admin.ModelAdmin):
+    """Admin for CalendarFeed model."""
+    
+    list_display = ('user', 'created_at')
+    search_fields = ('user__email',)
+    readonly_fields = ('token',)
+
+
 admin.site.register(InterviewQuestion)
 admin.site.register(PracticeAnswer)
\ No newline at end of file
@@ -0,0 +1,130 @@
+# applications/archive.py
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.fields.json import KeyTransform
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from analytics.models import ApplicationTimeline, ArchivedApplicationTimeline, StatusTransition
+from .models import Application, ApplicationNote, ArchivedApplication, Interview
+
+
+# True while archive_batch deletes the rows it moved: the analytics receivers keep their counters,
+# since archived applications still count and the rebuilds read them from the archive tables
+archiving = ContextVar('archiving', default=False)
+
+
+def archive_cutoff(days=None):
+    """Creation date before which applications of closed jobs are archived."""
+    if days is None:
+        days = settings.APPLICATION_ARCHIVE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archivable_applications(cutoff):
+    """Applications of closed jobs created before the cutoff."""
+    return Application.objects.filter(job__status='closed', created_at__lt=cutoff)
+
+
+def archive_batch(cutoff, batch_size=500):
+    """
+    Move one batch of archivable applications and their timelines to the archive tables.
+    
+    Rows are locked with SKIP LOCKED so several movers can run side by side
+    and live requests touching other rows are never blocked. Archiving is
+    analytics-neutral: counters are left as they are and status transitions
+    move into the history, so rebuilds count archived applications too.
+    
+    Args:
+        cutoff: Only applications created before this datetime are moved
+        batch_size: Maximum number of applications moved in this batch
+    
+    Returns:
+        The number of applications archived
+    """
+    with transaction.atomic():
+        applications = list(
+            archivable_applications(cutoff)
+            .select_for_update(skip_locked=True, of=('self',))
+            .order_by('id')[:batch_size]
+        )
+        if not applications:
+            return 0
+        ids = [application.id for application in applications]
+        
+        history = {pk: {'notes': [], 'interviews': [], 'transitions': []} for pk in ids}
+        for note in ApplicationNote.objects.filter(application_id__in=ids).values(
+            'application_id', 'text', 'created_at', 'created_by_id'
+        ):
+            history[note.pop('application_id')]['notes'].append(note)
+        for interview in Interview.objects.filter(application_id__in=ids).values(
+            'application_id', 'interview_type', 'scheduled_at', 'duration', 'location', 'notes'
+        ):
+            history[interview.pop('application_id')]['interviews'].append(interview)
+        for transition in StatusTransition.objects.filter(application_id__in=ids).order_by('changed_at', 'id').values(
+            'application_id', 'from_status', 'to_status', 'changed_at', 'stage_seconds'
+        ):
+            history[transition.pop('application_id')]['transitions'].append(transition)
+        
+        ArchivedApplication.objects.bulk_create([
+            ArchivedApplication(
+                id=application.id,
+                jobseeker_id=application.jobseeker_id,
+                job_id=application.job_id,
+                cover_letter=application.cover_letter,
+                resume=application.resume.name or None,
+                status=application.status,
+                candidate_snapshot=application.candidate_snapshot,
+                created_at=application.created_at,
+                updated_at=application.updated_at,
+                history=history[application.id],
+            )
+            for application in applications
+        ])
+        ArchivedApplicationTimeline.objects.bulk_create([
+            ArchivedApplicationTimeline(
+                id=event.id,
+                application_id=event.application_id,
+                event_type=event.event_type,
+                event_date=event.event_date,
+                notes=event.notes,
+                recorded_at=event.recorded_at,
+            )
+            for event in ApplicationTimeline.objects.filter(application_id__in=ids)
+        ])
+        token = archiving.set(True)
+        try:
+            Application.objects.filter(id__in=ids).delete()
+        finally:
+            archiving.reset(token)
+    return len(ids)
+
+
+def archived_timeline(application_id):
+    """Timeline events of an archived application, newest first."""
+    return list(
+        ArchivedApplicationTimeline.objects.filter(application_id=application_id)
+        .values('id', 'event_type', 'event_date', 'notes')
+    )
+
+
+def archived_with_transitions(queryset, *fields):
+    """
+    Yield the given fields of archived applications followed by their status transitions.
+
+    Transitions are oldest first with ``changed_at`` parsed; applications
+    archived before transitions were kept have none.
+    """
+    rows = (
+        queryset.annotate(transitions=KeyTransform('transitions', 'history'))
+        .values_list(*fields, 'transitions')
+        .iterator(chunk_size=2000)
+    )
+    for *values, transitions in rows:
+        yield (*values, [
+            {**transition, 'changed_at': parse_datetime(transition['changed_at'])}
+            for transition in transitions or []
+        ])
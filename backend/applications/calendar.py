@@ -0,0 +1,157 @@
+# applications/calendar.py
+import hashlib
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from .models import CalendarFeed, Interview
+
+FEED_CACHE_TIMEOUT = 60 * 60  # Upcoming window rolls forward at least hourly
+EVENT_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def feed_cache_key(token):
+    return f"calendar_feed:{token}"
+
+
+def _event_cache_key(pk, updated_at):
+    return f"calendar_event:{pk}:{updated_at.timestamp()}"
+
+
+def _escape(value):
+    """Escape a TEXT value as required by RFC 5545."""
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;')
+        .replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Fold a content line to 75 octets per RFC 5545."""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while len(encoded) > 75:
+        cut = 75 if not parts else 74
+        # Never split inside a multi-byte character
+        while cut and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    parts.append(encoded.decode('utf-8'))
+    return '\r\n '.join(parts)
+
+
+def _format_dt(value):
+    return value.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def render_event(interview):
+    """Render one interview as a VEVENT block."""
+    application = interview.application
+    summary = (
+        f"{interview.get_interview_type_display()} interview: {application.jobseeker.full_name} "
+        f"for {application.job.title} at {application.job.company.company_name}"
+    )
+    lines = [
+        'BEGIN:VEVENT',
+        f"UID:interview-{interview.pk}@job-application-tracker",
+        f"DTSTAMP:{_format_dt(interview.updated_at)}",
+        f"DTSTART:{_format_dt(interview.scheduled_at)}",
+        f"DTEND:{_format_dt(interview.ends_at)}",
+        f"SUMMARY:{_escape(summary)}",
+    ]
+    if interview.location:
+        lines.append(f"LOCATION:{_escape(interview.location)}")
+    if interview.notes:
+        lines.append(f"DESCRIPTION:{_escape(interview.notes)}")
+    lines.append('END:VEVENT')
+    return '\r\n'.join(_fold(line) for line in lines)
+
+
+def interviews_for_user(user):
+    """Upcoming interviews visible to a company or job seeker user."""
+    queryset = Interview.objects.filter(scheduled_at__gte=timezone.now())
+    if user.user_type == 'company':
+        return queryset.filter(company__user=user)
+    if user.user_type == 'jobseeker':
+        return queryset.filter(application__jobseeker__user=user)
+    return queryset.none()
+
+
+def build_feed(user):
+    """
+    Build the iCalendar document for a user.
+    
+    Rendered events are cached per (interview, updated_at), so after an
+    invalidation only the interviews that actually changed are re-rendered.
+    
+    Returns:
+        A (body, etag) tuple
+    """
+    rows = list(interviews_for_user(user).order_by('scheduled_at').values_list('pk', 'updated_at'))
+    keys = {pk: _event_cache_key(pk, updated_at) for pk, updated_at in rows}
+    events = cache.get_many(list(keys.values()))
+    
+    missing = [pk for pk, key in keys.items() if key not in events]
+    if missing:
+        rendered = {}
+        stale = Interview.objects.filter(pk__in=missing).select_related(
+            'application__jobseeker', 'application__job__company'
+        )
+        for interview in stale:
+            rendered[_event_cache_key(interview.pk, interview.updated_at)] = render_event(interview)
+        cache.set_many(rendered, EVENT_CACHE_TIMEOUT)
+        events.update(rendered)
+    
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Job Application Tracker//Interviews//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        'X-WR-CALNAME:Interviews',
+    ]
+    # An interview updated between the two queries simply drops out until the next rebuild
+    lines.extend(events[key] for key in keys.values() if key in events)
+    lines.append('END:VCALENDAR')
+    body = '\r\n'.join(lines) + '\r\n'
+    etag = '"' + hashlib.sha256(body.encode('utf-8')).hexdigest()[:32] + '"'
+    return body, etag
+
+
+def get_cached_feed(token):
+    """
+    Return (body, etag) for a feed token, or None if the token is unknown.
+    
+    A cache hit is served without touching the database at all.
+    """
+    key = feed_cache_key(token)
+    cached = cache.get(key)
+    if cached is None:
+        feed = CalendarFeed.objects.select_related('user').filter(token=token).first()
+        if feed is None:
+            return None
+        cached = build_feed(feed.user)
+        cache.set(key, cached, FEED_CACHE_TIMEOUT)
+    return cached
+
+
+def invalidate_feeds(user_ids):
+    """Drop cached feeds of the given users once the current transaction commits."""
+    user_ids = [user_id for user_id in user_ids if user_id]
+    if not user_ids:
+        return
+    
+    def _invalidate():
+        tokens = CalendarFeed.objects.filter(user_id__in=user_ids).values_list('token', flat=True)
+        cache.delete_many([feed_cache_key(token) for token in tokens])
+    
+    transaction.on_commit(_invalidate)
+
+
+def revoke_feed(token):
+    """Drop the cached feed of a token that is being replaced, once the current transaction commits."""
+    transaction.on_commit(lambda: cache.delete(feed_cache_key(token)))
@@ -0,0 +1,157 @@
+# applications/exports.py
+import csv
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Public column name -> ORM path on Application
+EXPORT_COLUMNS = {
+    'id': 'id',
+    'job_id': 'job_id',
+    'job_title': 'job__title',
+    'applicant_name': 'jobseeker__full_name',
+    'applicant_email': 'jobseeker__user__email',
+    'applicant_title': 'jobseeker__title',
+    'applicant_location': 'jobseeker__location',
+    'status': 'status',
+    'cover_letter': 'cover_letter',
+    'resume': 'resume',
+    'applied_date': 'created_at',
+    'updated_at': 'updated_at',
+}
+DEFAULT_EXPORT_COLUMNS = [name for name in EXPORT_COLUMNS if name != 'cover_letter']
+# Leading characters that make spreadsheet applications treat a CSV field as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Buffer:
+    """Write-only file object whose contents are drained by the streaming generator."""
+    
+    def __init__(self):
+        self.chunks = []
+    
+    def write(self, data):
+        self.chunks.append(data)
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self):
+        data = b''.join(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8') for chunk in self.chunks)
+        self.chunks = []
+        return data
+
+
+def _cell(value):
+    """Convert a database value to export text."""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_cell(value):
+    """
+    A CSV field, with text a spreadsheet would evaluate as a formula quoted by an apostrophe.
+    
+    XLSX needs no such guard: its text goes in inline string cells, which are
+    never evaluated.
+    """
+    value = _cell(value)
+    if isinstance(value, str) and value[:1] in FORMULA_PREFIXES:
+        return "'" + value
+    return value
+
+
+def stream_csv(header, rows):
+    """Yield a CSV document row by row."""
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    yield buffer.drain()
+    for row in rows:
+        writer.writerow([_csv_cell(value) for value in row])
+        yield buffer.drain()
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Applications" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '</Relationships>'
+)
+
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        value = _cell(value)
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>')
+        else:
+            cells.append(f'<c><v>{value}</v></c>')
+    return '<row>' + ''.join(cells) + '</row>'
+
+
+def stream_xlsx(header, rows, flush_every=500):
+    """
+    Yield a single-sheet XLSX workbook without holding it in memory.
+    
+    The workbook is written through zipfile onto an unseekable buffer, which
+    makes zipfile emit data descriptors instead of seeking back, so each
+    compressed chunk can be sent as soon as it is produced.
+    """
+    buffer = _Buffer()
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as workbook:
+        workbook.writestr('[Content_Types].xml', _CONTENT_TYPES)
+        workbook.writestr('_rels/.rels', _ROOT_RELS)
+        workbook.writestr('xl/workbook.xml', _WORKBOOK)
+        workbook.writestr('xl/_rels/workbook.xml.rels', _WORKBOOK_RELS)
+        yield buffer.drain()
+        
+        with workbook.open('xl/worksheets/sheet1.xml', mode='w', force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(header).encode('utf-8'))
+            for count, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row).encode('utf-8'))
+                if count % flush_every == 0:
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            sheet.write(b'</sheetData></worksheet>')
+    yield buffer.drain()
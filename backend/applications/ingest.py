@@ -0,0 +1,153 @@
+# applications/ingest.py
+import logging
+import signal
+import time
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from analytics import cohorts, job_stats, metrics, trends, uniques
+from analytics.funnel import invalidate_funnels
+from analytics.models import ApplicationTimeline
+from config.utils import bump_cache_version
+from .matching import match_scope
+from .models import Application, QueuedApplication
+from .pipeline import pipeline_scope
+from .search import refresh_search_vectors
+from .snapshots import build_candidate_snapshot
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_ERROR = "You have already applied to this job."
+
+
+def index_new_applications(applications, jobs):
+    """
+    Do the post_save work for applications created with bulk_create.
+
+    Builds their search documents, counts them in the candidates' metrics and
+    cohort activity, their jobs' daily stats and the unique applicant
+    sketches, and invalidates the funnels, hiring boards and match rankings
+    they appear in.
+    """
+    metrics.record_created(applications)
+    job_stats.record_applied(applications)
+    uniques.record_applied(applications, {job.pk: job.company_id for job in jobs})
+    cohorts.record_applied(applications)
+    invalidate_funnels([application.jobseeker_id for application in applications], [job.pk for job in jobs])
+    refresh_search_vectors(Application.objects.filter(pk__in=[application.pk for application in applications]))
+    for company_id in {job.company_id for job in jobs}:
+        bump_cache_version(pipeline_scope(company_id))
+    for job in jobs:
+        bump_cache_version(match_scope(job.pk))
+
+
+def _create_individually(applications):
+    """Fallback when a concurrent synchronous apply made the bulk insert conflict."""
+    created = []
+    for application in applications:
+        try:
+            with transaction.atomic():
+                # bulk_create, like the batch path, so post_save work is done once by the caller
+                Application.objects.bulk_create([application])
+            created.append(application)
+        except IntegrityError:
+            pass
+    return created
+
+
+def process_batch(batch_size=200):
+    """
+    Commit one batch of queued applications.
+
+    Rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so a pool of
+    workers can drain the queue concurrently. Each batch costs a handful of
+    queries plus one snapshot per candidate, instead of a full request per
+    application.
+
+    Returns:
+        The number of queued applications processed
+    """
+    with transaction.atomic():
+        queued = list(
+            QueuedApplication.objects.filter(status='queued')
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('job', 'jobseeker')
+            .order_by('id')[:batch_size]
+        )
+        if not queued:
+            return 0
+
+        existing = set(
+            Application.objects.filter(
+                jobseeker_id__in={item.jobseeker_id for item in queued},
+                job_id__in={item.job_id for item in queued},
+            ).values_list('jobseeker_id', 'job_id')
+        )
+        snapshots = {}
+        pending = {}
+        for item in queued:
+            if (item.jobseeker_id, item.job_id) in existing:
+                continue
+            if item.jobseeker_id not in snapshots:
+                snapshots[item.jobseeker_id] = build_candidate_snapshot(item.jobseeker)
+            pending[item.pk] = Application(
+                jobseeker_id=item.jobseeker_id, job_id=item.job_id, cover_letter=item.cover_letter,
+                resume=item.resume.name or None, candidate_snapshot=snapshots[item.jobseeker_id]
+            )
+
+        try:
+            with transaction.atomic():
+                created = Application.objects.bulk_create(list(pending.values()))
+        except IntegrityError:
+            created = _create_individually(list(pending.values()))
+        created_ids = {application.pk for application in created if application.pk}
+
+        now = timezone.now()
+        owners = {item.jobseeker_id: item.jobseeker.user_id for item in queued}
+        events = ApplicationTimeline.objects.bulk_create([
+            ApplicationTimeline(
+                application=application,
+                user_id=owners[application.jobseeker_id],
+                event_type='submitted',
+                event_date=now,
+                notes='Application submitted by job seeker.'
+            )
+            for application in created
+        ])
+        trends.record_events(events)
+        index_new_applications(created, list({item.job_id: item.job for item in queued}.values()))
+
+        for item in queued:
+            application = pending.get(item.pk)
+            if application is not None and application.pk in created_ids:
+                item.status = 'accepted'
+                item.application = application
+            else:
+                item.status = 'rejected'
+                item.error = DUPLICATE_ERROR
+            item.processed_at = now
+        QueuedApplication.objects.bulk_update(queued, ['status', 'application', 'error', 'processed_at'])
+    return len(queued)
+
+
+def run_worker(batch_size=200, poll_interval=1.0, once=False):
+    """Commit queued applications until interrupted, sleeping while the queue is empty."""
+    stopping = []
+
+    def _stop(signum, frame):
+        logger.info("Apply worker stopping after the current batch")
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    total = 0
+    while not stopping:
+        processed = process_batch(batch_size)
+        total += processed
+        if once and not processed:
+            break
+        if not processed:
+            time.sleep(poll_interval)
+    return total
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from applications.archive import archivable_applications, archive_batch, archive_cutoff
+
+
+class Command(BaseCommand):
+    help = "Move applications of closed jobs older than the archive age to the archive tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=None,
+                            help="Override APPLICATION_ARCHIVE_AFTER_DAYS.")
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--max-batches', type=int, default=None,
+                            help="Stop after this many batches (default: until nothing is left).")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Only report how many applications would be archived.")
+
+    def handle(self, *args, **options):
+        cutoff = archive_cutoff(options['older_than_days'])
+        if options['dry_run']:
+            count = archivable_applications(cutoff).count()
+            self.stdout.write(f"{count} applications created before {cutoff:%Y-%m-%d} would be archived.")
+            return
+
+        total = 0
+        batches = 0
+        while options['max_batches'] is None or batches < options['max_batches']:
+            moved = archive_batch(cutoff, options['batch_size'])
+            if not moved:
+                break
+            total += moved
+            batches += 1
+            self.stdout.write(f"Archived batch {batches}: {moved} applications")
+        self.stdout.write(self.style.SUCCESS(f"Archived {total} applications in {batches} batches."))
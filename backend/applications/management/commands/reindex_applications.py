@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from applications.models import Application
+from applications.search import refresh_search_vectors
+
+
+class Command(BaseCommand):
+    help = "Rebuild applicant search documents in primary key batches (resumable with --start-after)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--start-after', type=int, default=0,
+                            help="Resume from this application id.")
+        parser.add_argument('--missing-only', action='store_true',
+                            help="Only index applications that have no search document yet.")
+
+    def handle(self, *args, **options):
+        queryset = Application.objects.order_by('pk')
+        if options['missing_only']:
+            queryset = queryset.filter(search_vector__isnull=True)
+
+        last_pk = options['start_after']
+        total = 0
+        while True:
+            ids = list(queryset.filter(pk__gt=last_pk).values_list('pk', flat=True)[:options['batch_size']])
+            if not ids:
+                break
+            refresh_search_vectors(Application.objects.filter(pk__in=ids))
+            total += len(ids)
+            last_pk = ids[-1]
+            self.stdout.write(f"Indexed {total} applications (last id {last_pk})")
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} applications."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from applications.ingest import run_worker
+
+
+class Command(BaseCommand):
+    help = "Commit applications queued in queued apply mode, in batches, until stopped. Run several for a pool."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--poll-interval', type=float, default=1.0,
+                            help="Seconds to sleep when the queue is empty.")
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once the queue is drained instead of polling.")
+
+    def handle(self, *args, **options):
+        total = run_worker(
+            batch_size=options['batch_size'],
+            poll_interval=options['poll_interval'],
+            once=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} queued applications."))
@@ -0,0 +1,124 @@
+# applications/matching.py
+from collections import defaultdict
+from datetime import date
+
+from django.core.cache import cache
+
+from config.utils import cache_version
+from users.models import Experience, JobSeekerSkill
+from .models import Application
+
+MATCH_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Years of experience at which a candidate fully meets each level
+EXPERIENCE_TARGET_YEARS = {
+    'entry': 0,
+    'mid': 3,
+    'senior': 5,
+    'executive': 10,
+}
+
+SKILL_WEIGHT = 60
+EXPERIENCE_WEIGHT = 30
+LOCATION_WEIGHT = 10
+
+
+def match_scope(job_id):
+    return f"match:{job_id}"
+
+
+def experience_years(periods, today):
+    """Total years covered by a candidate's experience, counting overlapping jobs once."""
+    total_days = 0
+    current_start = current_end = None
+    # Current jobs (no end) run until today; normalised before sorting so None is never compared
+    for start, end in sorted((start, min(end or today, today)) for start, end in periods):
+        if end <= start:
+            continue
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total_days += (current_end - current_start).days
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total_days += (current_end - current_start).days
+    return total_days / 365.25
+
+
+def location_matches(job_location, candidate_location):
+    job_location = (job_location or '').strip().lower()
+    candidate_location = (candidate_location or '').strip().lower()
+    if 'remote' in job_location:
+        return True
+    return bool(job_location and candidate_location) and (
+        job_location in candidate_location or candidate_location in job_location
+    )
+
+
+def score_applicants(job):
+    """
+    Score every applicant of a job against its skills, experience level and location.
+
+    Uses four queries regardless of the number of applicants: the job's skills,
+    the applicants, their matching skills and their experience periods.
+
+    Args:
+        job: The Job to rank applicants for
+
+    Returns:
+        A list of (application_id, score) tuples, best match first. Scores range 0-100.
+    """
+    required = set(job.skills.values_list('skill_id', flat=True))
+    applicants = list(
+        Application.objects.filter(job=job).order_by().values_list('id', 'jobseeker_id', 'jobseeker__location')
+    )
+    jobseeker_ids = {jobseeker_id for _, jobseeker_id, _ in applicants}
+
+    matched = defaultdict(int)
+    if required:
+        for jobseeker_id in JobSeekerSkill.objects.filter(
+            jobseeker_id__in=jobseeker_ids, skill_id__in=required
+        ).values_list('jobseeker_id', flat=True):
+            matched[jobseeker_id] += 1
+
+    periods = defaultdict(list)
+    for jobseeker_id, start, end, is_current in Experience.objects.filter(
+        jobseeker_id__in=jobseeker_ids
+    ).order_by().values_list('jobseeker_id', 'start_date', 'end_date', 'is_current'):
+        periods[jobseeker_id].append((start, None if is_current else end))
+
+    today = date.today()
+    target_years = EXPERIENCE_TARGET_YEARS.get(job.experience_level, 0)
+    scores = []
+    for application_id, jobseeker_id, location in applicants:
+        skill_ratio = matched[jobseeker_id] / len(required) if required else 1
+        years = experience_years(periods[jobseeker_id], today)
+        experience_ratio = min(years / target_years, 1) if target_years else 1
+        location_ratio = 1 if location_matches(job.location, location) else 0
+        score = round(
+            SKILL_WEIGHT * skill_ratio
+            + EXPERIENCE_WEIGHT * experience_ratio
+            + LOCATION_WEIGHT * location_ratio
+        )
+        scores.append((application_id, score))
+
+    # Newest application first among equal scores
+    scores.sort(key=lambda item: (-item[1], -item[0]))
+    return scores
+
+
+def get_cached_scores(job):
+    """
+    Get the ranked applicant scores of a job, computing them on a cache miss.
+
+    The cache is invalidated by signals when the job, its skills, its
+    applications or an applicant's profile, skills or experience change.
+    """
+    version = cache_version(match_scope(job.pk))
+    key = f"match_scores:{job.pk}"
+    scores = cache.get(key, version=version)
+    if scores is None:
+        scores = score_applicants(job)
+        cache.set(key, scores, MATCH_CACHE_TIMEOUT, version=version)
+    return scores
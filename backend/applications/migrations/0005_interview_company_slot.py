@@ -0,0 +1,50 @@
+# Generated by Django 5.2 on 2026-10-19 07:51
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+
+def backfill_interview_slots(apps, schema_editor):
+    """Populate company and slot for interviews created before this migration."""
+    schema_editor.execute(
+        """
+        UPDATE applications_interview AS i
+        SET company_id = j.company_id,
+            slot = tstzrange(i.scheduled_at, i.scheduled_at + make_interval(mins => i.duration), '[)')
+        FROM applications_application AS a
+        JOIN jobs_job AS j ON j.id = a.job_id
+        WHERE a.id = i.application_id
+        """
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_alter_practiceanswer_score'),
+        ('jobs', '0002_alter_job_salary'),
+        ('users', '0004_alter_user_user_type'),
+    ]
+
+    operations = [
+        # Lets the GiST index combine the company equality with the range overlap
+        BtreeGistExtension(),
+        migrations.AddField(
+            model_name='interview',
+            name='company',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='interviews', to='users.companyprofile'),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='slot',
+            field=django.contrib.postgres.fields.ranges.DateTimeRangeField(editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_interview_slots, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='interview',
+            index=django.contrib.postgres.indexes.GistIndex(fields=['company', 'slot'], name='interview_company_slot_gist'),
+        ),
+    ]
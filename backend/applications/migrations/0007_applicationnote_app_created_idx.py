@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 07:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_calendarfeed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicationnote',
+            index=models.Index(fields=['application', '-created_at'], name='appnote_app_created_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-19 07:55
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0007_applicationnote_app_created_idx'),
+        ('jobs', '0002_alter_job_salary'),
+        ('users', '0004_alter_user_user_type'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedApplication',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('cover_letter', models.TextField(blank=True)),
+                ('resume', models.FileField(blank=True, null=True, upload_to='application_resumes/')),
+                ('status', models.CharField(choices=[('New', 'New'), ('Under Review', 'Under Review'), ('Shortlisted', 'Shortlisted'), ('Interviewed', 'Interviewed'), ('Rejected', 'Rejected'), ('Offer', 'Offer'), ('Hired', 'Hired'), ('Withdrawn', 'Withdrawn')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('history', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='jobs.job')),
+                ('jobseeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_applications', to='users.jobseekerprofile')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 07:58
+
+import users.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0008_archivedapplication'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=users.storage.ContentAddressedStorage(), upload_to='application_resumes/'),
+        ),
+        migrations.AlterField(
+            model_name='archivedapplication',
+            name='resume',
+            field=models.FileField(blank=True, null=True, storage=users.storage.ContentAddressedStorage(), upload_to='application_resumes/'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2 on 2026-10-19 07:59
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0009_content_addressed_resumes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='candidate_snapshot',
+            field=models.JSONField(blank=True, editable=False, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedapplication',
+            name='candidate_snapshot',
+            field=models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2 on 2026-10-19 08:01
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0010_application_candidate_snapshot'),
+        ('jobs', '0002_alter_job_salary'),
+        ('users', '0006_resumeblob_extraction'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='application_search_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status', '-created_at'], name='application_job_status_idx'),
+        ),
+    ]
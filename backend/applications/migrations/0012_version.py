@@ -0,0 +1,23 @@
+# Generated by Django 5.2 on 2026-10-19 08:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0011_application_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='interview',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
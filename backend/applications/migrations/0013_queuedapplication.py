@@ -0,0 +1,39 @@
+# Generated by Django 5.2 on 2026-10-19 08:06
+
+import django.db.models.deletion
+import users.storage
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0012_version'),
+        ('jobs', '0002_alter_job_salary'),
+        ('users', '0006_resumeblob_extraction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueuedApplication',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tracking_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('cover_letter', models.TextField(blank=True)),
+                ('resume', models.FileField(blank=True, null=True, storage=users.storage.ContentAddressedStorage(), upload_to='application_resumes/')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('accepted', 'Accepted'), ('rejected', 'Rejected')], default='queued', max_length=10)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('application', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='applications.application')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='queued_applications', to='jobs.job')),
+                ('jobseeker', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='queued_applications', to='users.jobseekerprofile')),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='queuedapp_status_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'queued')), fields=('jobseeker', 'job'), name='queuedapp_unique_pending')],
+            },
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2 on 2026-10-19 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0013_queuedapplication'),
+        ('jobs', '0002_alter_job_salary'),
+        ('users', '0006_resumeblob_extraction'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['updated_at'], name='application_updated_idx'),
+        ),
+    ]
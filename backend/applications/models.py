@@ -1,5 +1,16 @@
+import secrets
+import uuid
+from datetime import timedelta
+
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GinIndex, GistIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
-from users.models import JobSeekerProfile
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from config.utils import bump_version
+from users.models import JobSeekerProfile, CompanyProfile
+from users.storage import resume_storage
 from jobs.models import Job
 
 
@@ -20,18 +31,41 @@ class Application(models.Model):
     jobseeker = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE, related_name='applications')
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applications')
     cover_letter = models.TextField(blank=True)
-    resume = models.FileField(upload_to='application_resumes/', blank=True, null=True)
+    resume = models.FileField(upload_to='application_resumes/', storage=resume_storage, blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='New')
+    # Candidate profile as it was when they applied; see applications.snapshots
+    candidate_snapshot = models.JSONField(null=True, blank=True, editable=False, encoder=DjangoJSONEncoder)
+    # Weighted document over snapshot, cover letter and resume text; see applications.search
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Bumped on every save; compared against If-Match for optimistic concurrency
+    version = models.PositiveIntegerField(default=1, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         unique_together = ('jobseeker', 'job')
         ordering = ['-created_at']
+        indexes = [
+            GinIndex(fields=['search_vector'], name='application_search_gin'),
+            models.Index(fields=['job', 'status', '-created_at'], name='application_job_status_idx'),
+            # Incremental analytics rollups scan for recently changed applications
+            models.Index(fields=['updated_at'], name='application_updated_idx'),
+        ]
     
     def __str__(self):
         return f"{self.jobseeker.full_name} - {self.job.title} at {self.job.company.company_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Stored status, so post_save handlers can tell a status change from other edits
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+    
+    def save(self, *args, **kwargs):
+        bump_version(self, kwargs)
+        super().save(*args, **kwargs)
+    
     @property
     def applicant_name(self):
         return self.jobseeker.full_name
@@ -57,6 +91,66 @@ class Application(models.Model):
         return self.job.experience_level
 
 
+class ArchivedApplication(models.Model):
+    """Application moved out of the hot table once its job is closed and it has aged out."""
+    
+    id = models.BigIntegerField(primary_key=True)  # Same id the application had while live
+    jobseeker = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE, related_name='archived_applications')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='archived_applications')
+    cover_letter = models.TextField(blank=True)
+    resume = models.FileField(upload_to='application_resumes/', storage=resume_storage, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    candidate_snapshot = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+    # Notes and interviews of the application, kept as a read-only record
+    history = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    
+    class Meta:
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Archived application {self.pk} - {self.job_id}"
+
+
+class QueuedApplication(models.Model):
+    """Application accepted in queued apply mode, waiting for the apply worker to commit it."""
+    
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('accepted', 'Accepted'),
+        ('rejected', 'Rejected'),
+    ]
+    
+    tracking_id = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    jobseeker = models.ForeignKey(JobSeekerProfile, on_delete=models.CASCADE, related_name='queued_applications')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='queued_applications')
+    cover_letter = models.TextField(blank=True)
+    # Already streamed to storage by the request
+    resume = models.FileField(upload_to='application_resumes/', storage=resume_storage, blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    application = models.ForeignKey(Application, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'id'], name='queuedapp_status_idx'),
+        ]
+        constraints = [
+            # A candidate cannot queue the same job twice while the first is pending
+            models.UniqueConstraint(
+                fields=['jobseeker', 'job'], condition=models.Q(status='queued'), name='queuedapp_unique_pending'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Queued application {self.tracking_id} ({self.status})"
+
+
 class ApplicationNote(models.Model):
     """Notes for job applications from company/recruiters."""
     
@@ -67,11 +161,22 @@ class ApplicationNote(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['application', '-created_at'], name='appnote_app_created_idx'),
+        ]
     
     def __str__(self):
         return f"Note for {self.application} - {self.created_at.strftime('%Y-%m-%d')}"
 
 
+class InterviewQuerySet(models.QuerySet):
+    """QuerySet with interval lookups backed by the (company, slot) GiST index."""
+
+    def overlapping(self, company, start, end):
+        """Interviews of a company whose slot overlaps [start, end)."""
+        return self.filter(company=company, slot__overlap=DateTimeTZRange(start, end, '[)'))
+
+
 class Interview(models.Model):
     """Interview model for scheduling interviews."""
     
@@ -89,14 +194,52 @@ class Interview(models.Model):
     location = models.CharField(max_length=255, blank=True)
     notes = models.TextField(blank=True)  # Changed from details
     duration = models.PositiveIntegerField(help_text="Duration in minutes", default=60)  # Added field
+    # Denormalized from application.job.company and scheduled_at/duration so
+    # overlap checks can be answered by a single GiST index lookup.
+    company = models.ForeignKey(CompanyProfile, on_delete=models.CASCADE, related_name='interviews', null=True, editable=False)
+    slot = DateTimeRangeField(null=True, editable=False)
+    version = models.PositiveIntegerField(default=1, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)  # Added field
     
+    objects = InterviewQuerySet.as_manager()
+    
     class Meta:
         ordering = ['scheduled_at']  # Updated from interview_date
+        indexes = [
+            GistIndex(fields=['company', 'slot'], name='interview_company_slot_gist'),
+        ]
     
     def __str__(self):
         return f"{self.application} - {self.get_interview_type_display()} on {self.scheduled_at.strftime('%Y-%m-%d %H:%M')}"
+    
+    @property
+    def ends_at(self):
+        return self.scheduled_at + timedelta(minutes=self.duration)
+    
+    def save(self, *args, **kwargs):
+        self.company_id = self.application.job.company_id
+        self.slot = DateTimeTZRange(self.scheduled_at, self.ends_at, '[)')
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = set(update_fields) | {'company', 'slot'}
+        bump_version(self, kwargs)
+        super().save(*args, **kwargs)
+
+
+def generate_feed_token():
+    return secrets.token_urlsafe(32)
+
+
+class CalendarFeed(models.Model):
+    """Secret token that lets calendar clients read a user's interviews."""
+    
+    user = models.OneToOneField('users.User', on_delete=models.CASCADE, related_name='calendar_feed')
+    token = models.CharField(max_length=64, unique=True, default=generate_feed_token)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    def __str__(self):
+        return f"Calendar feed for {self.user.email}"
 
 
 class InterviewQuestion(models.Model):
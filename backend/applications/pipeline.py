@@ -0,0 +1,96 @@
+# applications/pipeline.py
+from django.core.cache import cache
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from config.utils import cache_version
+from jobs.models import Job
+from .models import Application
+
+PIPELINE_CACHE_TIMEOUT = 60 * 15
+
+
+def pipeline_scope(company_id):
+    return f"pipeline:{company_id}"
+
+
+def build_pipeline(company, cards_per_column, job_id=None):
+    """
+    Build the hiring board of a company.
+    
+    Uses three queries regardless of the number of applications: the jobs, one
+    grouped count per (job, status), and one ROW_NUMBER() window query that
+    keeps only the newest cards of each column.
+    
+    Args:
+        company: The CompanyProfile whose jobs are shown
+        cards_per_column: Number of cards returned per (job, status) column
+        job_id: Optional job to restrict the board to
+    
+    Returns:
+        A dict with one entry per job, each holding one column per status
+    """
+    jobs = Job.objects.filter(company=company)
+    applications = Application.objects.filter(job__company=company)
+    if job_id is not None:
+        jobs = jobs.filter(pk=job_id)
+        applications = applications.filter(job_id=job_id)
+    
+    counts = {
+        (row['job_id'], row['status']): row['count']
+        for row in applications.order_by().values('job_id', 'status').annotate(count=Count('id'))
+    }
+    
+    cards = {}
+    ranked = applications.annotate(
+        position=Window(
+            RowNumber(),
+            partition_by=[F('job_id'), F('status')],
+            order_by=F('created_at').desc(),
+        )
+    ).filter(position__lte=cards_per_column).order_by('job_id', 'status', 'position').values(
+        'id', 'job_id', 'status', 'created_at', 'updated_at',
+        jobseeker_name=F('jobseeker__full_name'),
+        jobseeker_title=F('jobseeker__title'),
+        jobseeker_location=F('jobseeker__location'),
+    )
+    for card in ranked:
+        cards.setdefault((card['job_id'], card['status']), []).append({
+            'id': card['id'],
+            'jobseeker_name': card['jobseeker_name'],
+            'jobseeker_title': card['jobseeker_title'],
+            'jobseeker_location': card['jobseeker_location'],
+            'applied_date': card['created_at'],
+            'updated_at': card['updated_at'],
+        })
+    
+    statuses = [choice[0] for choice in Application.STATUS_CHOICES]
+    board = []
+    for job in jobs.values('id', 'title', 'status'):
+        columns = [
+            {
+                'status': status,
+                'count': counts.get((job['id'], status), 0),
+                'cards': cards.get((job['id'], status), []),
+            }
+            for status in statuses
+        ]
+        board.append({
+            'job_id': job['id'],
+            'job_title': job['title'],
+            'job_status': job['status'],
+            'total': sum(column['count'] for column in columns),
+            'columns': columns,
+        })
+    return {'cards_per_column': cards_per_column, 'statuses': statuses, 'jobs': board}
+
+
+def get_cached_pipeline(company, cards_per_column, job_id=None):
+    """Return the hiring board of a company, rebuilding it only after a change."""
+    version = cache_version(pipeline_scope(company.pk))
+    key = f"pipeline:{company.pk}:{cards_per_column}:{job_id or 'all'}"
+    board = cache.get(key, version=version)
+    if board is None:
+        board = build_pipeline(company, cards_per_column, job_id=job_id)
+        cache.set(key, board, PIPELINE_CACHE_TIMEOUT, version=version)
+    return board
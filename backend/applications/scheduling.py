@@ -0,0 +1,80 @@
+# applications/scheduling.py
+from datetime import datetime, timedelta
+
+from django.utils import timezone
+
+from .models import Interview
+
+
+def find_conflicts(company, scheduled_at, duration, exclude_pk=None):
+    """
+    Return the company's interviews that overlap a proposed slot.
+    
+    Args:
+        company: The CompanyProfile owning the interviews
+        scheduled_at: Start of the proposed slot
+        duration: Length of the proposed slot in minutes
+        exclude_pk: Interview to ignore (the one being rescheduled)
+    
+    Returns:
+        A queryset of overlapping Interview objects
+    """
+    end = scheduled_at + timedelta(minutes=duration)
+    conflicts = Interview.objects.overlapping(company, scheduled_at, end)
+    if exclude_pk is not None:
+        conflicts = conflicts.exclude(pk=exclude_pk)
+    return conflicts
+
+
+def free_windows(company, start_date, end_date, day_start, day_end, min_duration):
+    """
+    Compute the free scheduling windows of a company over a date range.
+    
+    Busy intervals are fetched with one overlap query over the whole range and
+    swept in start order, so the cost is one index scan plus the number of
+    interviews actually in the range.
+    
+    Args:
+        company: The CompanyProfile whose calendar is inspected
+        start_date: First day of the range (inclusive)
+        end_date: Last day of the range (inclusive)
+        day_start: Working day start as a time
+        day_end: Working day end as a time
+        min_duration: Minimum window length in minutes
+    
+    Returns:
+        A list of {"date", "windows": [{"start", "end"}]} dicts, one per day
+    """
+    tz = timezone.get_current_timezone()
+    range_start = timezone.make_aware(datetime.combine(start_date, day_start), tz)
+    range_end = timezone.make_aware(datetime.combine(end_date, day_end), tz)
+    busy = list(
+        Interview.objects.overlapping(company, range_start, range_end)
+        .order_by('slot')
+        .values_list('slot', flat=True)
+    )
+    
+    now = timezone.now()
+    min_length = timedelta(minutes=min_duration)
+    days = []
+    index = 0
+    day = start_date
+    while day <= end_date:
+        cursor = max(timezone.make_aware(datetime.combine(day, day_start), tz), now)
+        closes = timezone.make_aware(datetime.combine(day, day_end), tz)
+        windows = []
+        # Skip intervals that ended before this day's window opens
+        while index < len(busy) and busy[index].upper <= cursor:
+            index += 1
+        scan = index
+        while cursor < closes and scan < len(busy) and busy[scan].lower < closes:
+            slot = busy[scan]
+            if slot.lower - cursor >= min_length:
+                windows.append({'start': cursor, 'end': slot.lower})
+            cursor = max(cursor, slot.upper)
+            scan += 1
+        if closes - cursor >= min_length:
+            windows.append({'start': cursor, 'end': closes})
+        days.append({'date': day, 'windows': windows})
+        day += timedelta(days=1)
+    return days
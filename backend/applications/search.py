@@ -0,0 +1,108 @@
+# applications/search.py
+from django.contrib.postgres.aggregates import StringAgg
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db.models import Case, F, IntegerField, OuterRef, Q, Subquery, TextField, Value, When
+from django.db.models.fields.json import KeyTextTransform, KeyTransform
+from django.db.models.functions import Cast, Coalesce, NullIf
+from django.db.models.lookups import IsNull
+
+from users.models import JobSeekerProfile, JobSeekerSkill, ResumeBlob
+from .models import Application
+
+SEARCH_CONFIG = 'english'
+# ts_rank is a float4; scaling to an integer keeps keyset comparisons exact
+RANK_SCALE = 1_000_000
+
+
+def snapshot_or_profile(snapshot_field, profile_value):
+    """A candidate field from the apply-time snapshot, or the live profile for applications that predate snapshots."""
+    return Case(
+        When(candidate_snapshot__isnull=True, then=profile_value),
+        default=snapshot_field,
+        output_field=TextField(),
+    )
+
+
+def submitted_resume():
+    """
+    Name of the resume an application was submitted with, for use in a subquery over it.
+    
+    Its own upload, else the resume in its candidate snapshot, else the
+    current profile resume for applications that predate snapshots.
+    """
+    profile_resume = JobSeekerProfile.objects.filter(pk=OuterRef(OuterRef('jobseeker_id'))).values('resume')[:1]
+    return Coalesce(
+        NullIf(OuterRef('resume'), Value('')),
+        Case(
+            When(IsNull(OuterRef('candidate_snapshot'), True), then=Subquery(profile_resume)),
+            default=KeyTextTransform('resume', OuterRef('candidate_snapshot')),
+            output_field=TextField(),
+        ),
+    )
+
+
+def uses_resume(name):
+    """Filter for applications whose search document reads the given resume blob; mirrors submitted_resume."""
+    without_upload = Q(resume__isnull=True) | Q(resume='')
+    return Q(resume=name) | (
+        without_upload
+        & (Q(candidate_snapshot__resume=name) | Q(candidate_snapshot__isnull=True, jobseeker__resume=name))
+    )
+
+
+def application_document():
+    """
+    Weighted search document of an application, built entirely in SQL.
+    
+    A: candidate title and skills, B: cover letter and about, C: text of the
+    submitted resume extracted by the resume worker. Candidate fields come
+    from the apply-time snapshot, or from the current profile when the
+    application has none.
+    """
+    profile = JobSeekerProfile.objects.filter(pk=OuterRef('jobseeker_id'))
+    profile_skills = (
+        JobSeekerSkill.objects.filter(jobseeker=OuterRef('jobseeker_id'))
+        .order_by().values('jobseeker')
+        .annotate(names=StringAgg('skill__name', delimiter=' '))
+        .values('names')
+    )
+    title = snapshot_or_profile(KeyTextTransform('title', 'candidate_snapshot'), Subquery(profile.values('title')[:1]))
+    skills = snapshot_or_profile(Cast(KeyTransform('skills', 'candidate_snapshot'), TextField()), Subquery(profile_skills))
+    about = snapshot_or_profile(KeyTextTransform('about', 'candidate_snapshot'), Subquery(profile.values('about')[:1]))
+    resume_text = Subquery(ResumeBlob.objects.filter(name=submitted_resume()).values('text')[:1])
+    return (
+        SearchVector(title, weight='A', config=SEARCH_CONFIG)
+        + SearchVector(skills, weight='A', config=SEARCH_CONFIG)
+        + SearchVector('cover_letter', weight='B', config=SEARCH_CONFIG)
+        + SearchVector(about, weight='B', config=SEARCH_CONFIG)
+        + SearchVector(resume_text, weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def refresh_search_vectors(queryset):
+    """Recompute the search document of every application in the queryset with one UPDATE."""
+    return queryset.update(search_vector=application_document())
+
+
+def search_applications(queryset, q=None, statuses=None, job_id=None, applied_after=None, applied_before=None):
+    """
+    Filter and rank applications.
+    
+    Every filter is served by the (job, status, created_at) index or the GIN
+    index on search_vector. With a query the results carry an integer ``rank``
+    for keyset pagination; without one they keep their creation order.
+    """
+    if job_id is not None:
+        queryset = queryset.filter(job_id=job_id)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+    if applied_after:
+        queryset = queryset.filter(created_at__date__gte=applied_after)
+    if applied_before:
+        queryset = queryset.filter(created_at__date__lte=applied_before)
+    if q:
+        query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+        queryset = queryset.filter(search_vector=query).annotate(
+            rank=Cast(SearchRank(F('search_vector'), query) * RANK_SCALE, output_field=IntegerField())
+        )
+    return queryset
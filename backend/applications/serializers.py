@@ -1,12 +1,29 @@
 from rest_framework import serializers
 from django.utils import timezone
 from django.core.validators import FileExtensionValidator
+from django.db.models import Exists, OuterRef
 import re
 from datetime import date, datetime, timedelta
-from .models import Application, ApplicationNote, Interview
+from .models import Application, ApplicationNote, Interview, QueuedApplication
 from users.models import JobSeekerProfile
+from users.storage import resume_storage
 from jobs.models import Job
 
+def validate_resume_file(value):
+    """Validate an uploaded resume's size and extension."""
+    if value:
+        # Check file size (limit to 10MB)
+        if value.size > 10 * 1024 * 1024:
+            raise serializers.ValidationError("Resume file too large (max 10MB).")
+        
+        # Check file extension
+        ext = value.name.split('.')[-1].lower()
+        valid_extensions = ['pdf', 'doc', 'docx']
+        if ext not in valid_extensions:
+            raise serializers.ValidationError(f"Unsupported file extension. Use {', '.join(valid_extensions)}.")
+    return value
+
+
 class ApplicationCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating job applications."""
     
@@ -38,17 +55,7 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
     
     def validate_resume(self, value):
         """Validate resume file."""
-        if value:
-            # Check file size (limit to 10MB)
-            if value.size > 10 * 1024 * 1024:
-                raise serializers.ValidationError("Resume file too large (max 10MB).")
-            
-            # Check file extension
-            ext = value.name.split('.')[-1].lower()
-            valid_extensions = ['pdf', 'doc', 'docx']
-            if ext not in valid_extensions:
-                raise serializers.ValidationError(f"Unsupported file extension. Use {', '.join(valid_extensions)}.")
-        return value
+        return validate_resume_file(value)
     
     def validate(self, attrs):
         """Cross-field validation."""
@@ -67,6 +74,45 @@ class ApplicationCreateSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class BatchApplicationCreateSerializer(serializers.Serializer):
+    """Serializer for applying to several jobs with one resume and cover letter."""
+    
+    MAX_JOBS = 20
+    
+    jobs = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=MAX_JOBS)
+    cover_letter = serializers.CharField(required=False, allow_blank=True, max_length=5000)
+    resume = serializers.FileField(required=False)
+    
+    def validate_resume(self, value):
+        """Validate resume file."""
+        return validate_resume_file(value)
+    
+    def validate_jobs(self, value):
+        """Validate every job in a single query: exists, active, open, not applied to."""
+        job_ids = list(dict.fromkeys(value))
+        jobseeker = self.context['jobseeker']
+        jobs = Job.objects.filter(pk__in=job_ids).annotate(
+            already_applied=Exists(Application.objects.filter(job=OuterRef('pk'), jobseeker=jobseeker))
+        ).select_related('company')
+        jobs = {job.pk: job for job in jobs}
+        
+        today = timezone.now().date()
+        errors = {}
+        for job_id in job_ids:
+            job = jobs.get(job_id)
+            if job is None:
+                errors[str(job_id)] = "Job does not exist."
+            elif job.status != 'active':
+                errors[str(job_id)] = "Cannot apply to inactive job."
+            elif job.application_deadline and job.application_deadline < today:
+                errors[str(job_id)] = "Application deadline has passed."
+            elif job.already_applied:
+                errors[str(job_id)] = "You have already applied to this job."
+        if errors:
+            raise serializers.ValidationError(errors)
+        return [jobs[job_id] for job_id in job_ids]
+
+
 class ApplicationSerializer(serializers.ModelSerializer):
     """Serializer for job applications."""
     
@@ -137,6 +183,68 @@ class ApplicationSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'jobseeker', 'job', 'created_at', 'updated_at']
 
 
+class ApplicationSnapshotSerializer(serializers.ModelSerializer):
+    """
+    Serializer for recruiter views that reads candidate data from the apply-time snapshot.
+    
+    Produces the same keys as ApplicationSerializer without touching the
+    candidate's profile tables. Applications created before snapshots existed
+    fall back to the live profile.
+    """
+    
+    job_title = serializers.CharField(source='job.title', read_only=True)
+    company_name = serializers.CharField(source='job.company.company_name', read_only=True)
+    salary = serializers.CharField(source='job.salary', read_only=True)
+    applied_date = serializers.DateTimeField(source='created_at', read_only=True)
+    job_id = serializers.IntegerField(source='job.id', read_only=True)
+    
+    class Meta:
+        model = Application
+        fields = [
+            'id', 'jobseeker', 'job', 'job_id', 'job_title', 'company_name', 'status', 'cover_letter', 'resume',
+            'applied_date', 'updated_at', 'salary'
+        ]
+        read_only_fields = fields
+    
+    def to_representation(self, instance):
+        snapshot = instance.candidate_snapshot
+        if not snapshot:
+            data = ApplicationSerializer(instance, context=self.context).data
+            data['profile_source'] = 'live'
+            return data
+        
+        data = super().to_representation(instance)
+        data.update({
+            'jobseeker_name': snapshot['full_name'],
+            'jobseeker_email': snapshot['email'],
+            'jobseeker_title': snapshot['title'],
+            'jobseeker_location': snapshot['location'],
+            'jobseeker_about': snapshot['about'],
+            'jobseeker_resume': resume_storage.url(snapshot['resume']) if snapshot['resume'] else None,
+            'jobseeker_skills': snapshot['skills'],
+            'jobseeker_education': snapshot['education'],
+            'jobseeker_experience': snapshot['experience'],
+            'jobseeker_social_links': snapshot['social_links'],
+            'profile_source': 'snapshot',
+            'profile_captured_at': snapshot['captured_at'],
+        })
+        return data
+
+
+class QueuedApplicationSerializer(serializers.ModelSerializer):
+    """Serializer for the outcome of an application submitted in queued apply mode."""
+    
+    job_title = serializers.CharField(source='job.title', read_only=True)
+    
+    class Meta:
+        model = QueuedApplication
+        fields = [
+            'tracking_id', 'job', 'job_title', 'status', 'application', 'error',
+            'created_at', 'processed_at'
+        ]
+        read_only_fields = fields
+
+
 class ApplicationStatusUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating application status."""
     
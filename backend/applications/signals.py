@@ -0,0 +1,66 @@
+# applications/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from config.utils import bump_cache_version
+from jobs.models import Job, JobSkill
+from users.models import CompanyProfile, Experience, JobSeekerProfile, JobSeekerSkill
+from .calendar import invalidate_feeds
+from .matching import match_scope
+from .models import Application, Interview
+from .pipeline import pipeline_scope
+from .search import refresh_search_vectors
+
+
+@receiver([post_save, post_delete], sender=Interview)
+def invalidate_interview_feeds(sender, instance, **kwargs):
+    """Invalidate the calendar feeds of the company and candidate of an interview."""
+    company_users = CompanyProfile.objects.filter(pk=instance.company_id).values_list('user_id', flat=True)
+    jobseeker_users = JobSeekerProfile.objects.filter(
+        applications__id=instance.application_id
+    ).values_list('user_id', flat=True)
+    invalidate_feeds(list(company_users) + list(jobseeker_users))
+
+
+@receiver([post_save, post_delete], sender=Application)
+def invalidate_company_pipeline(sender, instance, **kwargs):
+    """Invalidate the hiring board of the company that owns the application's job."""
+    company_id = Job.objects.filter(pk=instance.job_id).values_list('company_id', flat=True).first()
+    if company_id:
+        bump_cache_version(pipeline_scope(company_id))
+
+
+@receiver(post_save, sender=Application)
+def index_new_application(sender, instance, created, **kwargs):
+    """Build the search document of a new application."""
+    if created:
+        refresh_search_vectors(Application.objects.filter(pk=instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Application)
+def invalidate_job_match_scores_on_application(sender, instance, signal, created=False, **kwargs):
+    """Re-rank a job's applicants when one applies or an application is removed."""
+    if created or signal is post_delete:
+        bump_cache_version(match_scope(instance.job_id))
+
+
+@receiver(post_save, sender=Job)
+def invalidate_job_match_scores(sender, instance, **kwargs):
+    """Re-rank a job's applicants when its experience level or location may have changed."""
+    bump_cache_version(match_scope(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=JobSkill)
+def invalidate_job_skill_match_scores(sender, instance, **kwargs):
+    """Re-rank a job's applicants when its required skills change."""
+    bump_cache_version(match_scope(instance.job_id))
+
+
+@receiver(post_save, sender=JobSeekerProfile)
+@receiver([post_save, post_delete], sender=JobSeekerSkill)
+@receiver([post_save, post_delete], sender=Experience)
+def invalidate_candidate_match_scores(sender, instance, **kwargs):
+    """Re-rank every job a candidate applied to when their profile, skills or experience change."""
+    jobseeker_id = instance.pk if sender is JobSeekerProfile else instance.jobseeker_id
+    for job_id in Application.objects.filter(jobseeker_id=jobseeker_id).values_list('job_id', flat=True):
+        bump_cache_version(match_scope(job_id))
@@ -0,0 +1,32 @@
+# applications/snapshots.py
+from django.utils import timezone
+
+
+def build_candidate_snapshot(jobseeker):
+    """
+    Capture the parts of a job seeker's profile a recruiter sees, as plain JSON data.
+    
+    Args:
+        jobseeker: The JobSeekerProfile applying
+    
+    Returns:
+        A dict stored on Application.candidate_snapshot
+    """
+    user = jobseeker.user
+    return {
+        'full_name': jobseeker.full_name,
+        'email': user.email,
+        'title': jobseeker.title,
+        'location': jobseeker.location,
+        'about': jobseeker.about,
+        'resume': jobseeker.resume.name or None,
+        'skills': list(jobseeker.skills.order_by('skill__name').values_list('skill__name', flat=True)),
+        'education': list(jobseeker.education.values(
+            'institution', 'degree', 'field_of_study', 'start_date', 'end_date', 'is_current', 'description'
+        )),
+        'experience': list(jobseeker.experience.values(
+            'title', 'company', 'location', 'start_date', 'end_date', 'is_current', 'description'
+        )),
+        'social_links': list(user.social_links.values('platform', 'url')),
+        'captured_at': timezone.now(),
+    }
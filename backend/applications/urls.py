@@ -1,17 +1,25 @@
 from django.urls import path
 from .views import (
-    JobseekerApplicationsView, CompanyApplicationsView, JobApplicationsView,
-    ApplicationDetailView, ApplyForJobView, UpdateApplicationStatusView,
-    ApplicationNotesView, InterviewsView, InterviewDetailView
+    JobseekerApplicationsView, CompanyApplicationsView, JobApplicationsView, CompanyPipelineView,
+    CompanyApplicationsExportView, ApplicantSearchView,
+    ApplicationDetailView, ApplyForJobView, QueuedApplicationStatusView, BatchApplyForJobsView,
+    UpdateApplicationStatusView,
+    ApplicationNotesView, LatestApplicationNotesView, InterviewsView, InterviewDetailView,
+    InterviewAvailabilityView, CalendarFeedView, CalendarFeedICSView
 )
 
 urlpatterns = [
     # Job seeker application endpoints
     path('jobseeker/', JobseekerApplicationsView.as_view(), name='jobseeker_applications'),
     path('apply/', ApplyForJobView.as_view(), name='apply_for_job'),
+    path('apply/batch/', BatchApplyForJobsView.as_view(), name='batch_apply_for_jobs'),
+    path('apply/queued/<uuid:tracking_id>/', QueuedApplicationStatusView.as_view(), name='queued_application_status'),
     
     # Company application management endpoints
     path('company/', CompanyApplicationsView.as_view(), name='company_applications'),
+    path('company/pipeline/', CompanyPipelineView.as_view(), name='company_pipeline'),
+    path('company/export/', CompanyApplicationsExportView.as_view(), name='company_applications_export'),
+    path('company/search/', ApplicantSearchView.as_view(), name='company_applicant_search'),
     path('job/<int:job_id>/', JobApplicationsView.as_view(), name='job_applications'),
     
     # Application detail endpoints
@@ -20,8 +28,14 @@ urlpatterns = [
     
     # Application notes endpoints
     path('<int:application_id>/notes/', ApplicationNotesView.as_view(), name='application_notes'),
+    path('notes/latest/', LatestApplicationNotesView.as_view(), name='latest_application_notes'),
     
     # Interview endpoints
     path('<int:application_id>/interviews/', InterviewsView.as_view(), name='application_interviews'),
     path('interviews/<int:pk>/', InterviewDetailView.as_view(), name='interview_detail'),
+    path('interviews/available-slots/', InterviewAvailabilityView.as_view(), name='interview_available_slots'),
+    
+    # Interview calendar feed endpoints
+    path('calendar/', CalendarFeedView.as_view(), name='calendar_feed'),
+    path('calendar/<str:token>.ics', CalendarFeedICSView.as_view(), name='calendar_feed_ics'),
 ]
\ No newline at end of file
@@ -1,22 +1,48 @@
 # applications/views.py
+from datetime import date, datetime, timedelta
+
 from django.core.exceptions import ValidationError
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
 from django.db.utils import IntegrityError
+from django.conf import settings
+from django.db import transaction
+from django.http import HttpResponse, HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from rest_framework import status, permissions
 from rest_framework.views import APIView
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, AllowAny
 from users.models import JobSeekerProfile, CompanyProfile
 from django.utils import timezone
 
-from .models import Application, ApplicationNote, Interview
+from .models import Application, ApplicationNote, Interview, CalendarFeed, ArchivedApplication, QueuedApplication
 from .serializers import (
-    ApplicationSerializer, ApplicationCreateSerializer,
+    ApplicationSerializer, ApplicationCreateSerializer, BatchApplicationCreateSerializer,
+    ApplicationSnapshotSerializer, QueuedApplicationSerializer,
     ApplicationStatusUpdateSerializer, ApplicationNoteSerializer,
     InterviewSerializer
 )
 from jobs.models import Job
-from config.utils import api_response, log_error, StandardResultsSetPagination, get_paginated_response, PaginationMixin
+from config.utils import (
+    api_response, log_error, StandardResultsSetPagination, get_paginated_response, PaginationMixin,
+    StandardCursorPagination, get_cursor_paginated_response,
+    claim_version, etag_for_version, if_match_version, precondition_failed_response, atomic_stream
+)
 from analytics.models import ApplicationTimeline
+from analytics.trends import record_events as record_timeline_events
+from notifications.outbox import enqueue
+from .scheduling import find_conflicts, free_windows
+from .calendar import get_cached_feed, revoke_feed
+from .pipeline import get_cached_pipeline
+from .archive import archived_timeline
+from .snapshots import build_candidate_snapshot
+from .search import search_applications
+from .ingest import index_new_applications
+from .matching import get_cached_scores
+from .exports import (
+    EXPORT_CHUNK_SIZE, EXPORT_COLUMNS, DEFAULT_EXPORT_COLUMNS, stream_csv, stream_xlsx
+)
 
 
 class IsJobseeker(permissions.BasePermission):
@@ -33,6 +59,96 @@ class IsCompany(permissions.BasePermission):
         return request.user.is_authenticated and request.user.user_type == 'company'
 
 
+def expected_version(request, instance):
+    """The version a write must match: the client's If-Match, or the version read by this request."""
+    version = if_match_version(request)
+    return instance.version if version is None else version
+
+
+def recruiter_serializer_class(request):
+    """Serializer for recruiter reads: the apply-time snapshot, or the live profile with ?profile=live."""
+    if request.query_params.get('profile') == 'live':
+        return ApplicationSerializer
+    return ApplicationSnapshotSerializer
+
+
+def recruiter_queryset(queryset, request):
+    """Load only the relations the chosen recruiter serializer reads."""
+    if request.query_params.get('profile') == 'live':
+        return queryset.select_related('jobseeker__user', 'job__company').prefetch_related(
+            'jobseeker__skills__skill', 'jobseeker__education', 'jobseeker__experience',
+            'jobseeker__user__social_links'
+        )
+    return queryset.select_related('job__company')
+
+
+def notify_status_change(application, previous_status):
+    """Queue a notification telling the candidate their application status changed."""
+    job = application.job
+    enqueue(
+        'application_status_changed',
+        application.jobseeker.user,
+        subject=f"Your application for {job.title} is now {application.status}",
+        body=(
+            f"Hi {application.jobseeker.full_name},\n\n"
+            f"{job.company.company_name} moved your application for {job.title} "
+            f"from {previous_status} to {application.status}."
+        ),
+        payload={
+            'application_id': application.id,
+            'job_id': job.id,
+            'old_status': previous_status,
+            'new_status': application.status,
+        },
+    )
+
+
+def notify_interview(interview, event_type):
+    """Queue a notification telling the candidate about an interview change."""
+    application = interview.application
+    job = application.job
+    action = {
+        'interview_scheduled': 'scheduled',
+        'interview_updated': 'updated',
+        'interview_cancelled': 'cancelled',
+    }[event_type]
+    enqueue(
+        event_type,
+        application.jobseeker.user,
+        subject=f"Interview {action}: {job.title} at {job.company.company_name}",
+        body=(
+            f"Hi {application.jobseeker.full_name},\n\n"
+            f"Your {interview.get_interview_type_display()} interview for {job.title} "
+            f"on {interview.scheduled_at:%Y-%m-%d %H:%M} UTC has been {action}."
+        ),
+        payload={
+            'application_id': application.id,
+            'interview_id': interview.id,
+            'scheduled_at': interview.scheduled_at,
+            'duration': interview.duration,
+        },
+    )
+
+
+def interview_conflict_response(company, scheduled_at, duration, exclude_pk=None):
+    """
+    Return a 409 response if the slot clashes with another interview of the company.
+    
+    The company row is locked first so concurrent schedulers of the same
+    company are serialized until the surrounding request transaction commits.
+    """
+    CompanyProfile.objects.select_for_update().filter(pk=company.pk).exists()
+    conflicts = find_conflicts(company, scheduled_at, duration, exclude_pk=exclude_pk)
+    conflicts = list(conflicts.values('id', 'application', 'scheduled_at', 'duration')[:5])
+    if not conflicts:
+        return None
+    return api_response(
+        errors={"scheduled_at": "This slot overlaps another interview.", "conflicts": conflicts},
+        message="Interview slot is already booked",
+        status_code=status.HTTP_409_CONFLICT
+    )
+
+
 class JobseekerApplicationsView(PaginationMixin, APIView):
     """API endpoint for job seekers to view their applications."""
     
@@ -86,12 +202,13 @@ class CompanyApplicationsView(PaginationMixin, APIView):
         """Get all applications for the authenticated company's job postings."""
         try:
             company = request.user.company_profile
-            queryset = Application.objects.filter(job__company=company)
+            queryset = recruiter_queryset(Application.objects.filter(job__company=company), request)
+            serializer_class = recruiter_serializer_class(request)
             
             # Paginate results
             page = self.paginate_queryset(queryset)
             if page is not None:
-                serializer = ApplicationSerializer(page, many=True)
+                serializer = serializer_class(page, many=True)
                 return get_paginated_response(
                     self.paginator, 
                     serializer.data,
@@ -100,7 +217,7 @@ class CompanyApplicationsView(PaginationMixin, APIView):
                 )
             
             # If pagination is disabled
-            serializer = ApplicationSerializer(queryset, many=True)
+            serializer = serializer_class(queryset, many=True)
             return api_response(
                 data=serializer.data,
                 message="Applications retrieved successfully",
@@ -119,6 +236,185 @@ class CompanyApplicationsView(PaginationMixin, APIView):
             )
 
 
+class CompanyApplicationsExportView(APIView):
+    """API endpoint for companies to download all their applications as CSV or XLSX."""
+    
+    permission_classes = (IsCompany,)
+    content_types = {
+        'csv': 'text/csv; charset=utf-8',
+        'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+    }
+    
+    def get(self, request):
+        """Stream the export; rows are read through a server-side cursor as they are sent."""
+        try:
+            company = request.user.company_profile
+        except CompanyProfile.DoesNotExist:
+            return api_response(
+                message="Company profile not found for this user",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        
+        export_format = request.query_params.get('export_format', 'csv')
+        requested = request.query_params.get('columns')
+        columns = [name.strip() for name in requested.split(',') if name.strip()] if requested else DEFAULT_EXPORT_COLUMNS
+        unknown = [name for name in columns if name not in EXPORT_COLUMNS]
+        if export_format not in self.content_types or unknown or not columns:
+            return api_response(
+                errors={
+                    "export_format": f"Choose from: {', '.join(self.content_types)}.",
+                    "columns": f"Choose from: {', '.join(EXPORT_COLUMNS)}.",
+                },
+                message="Invalid export parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            queryset = Application.objects.filter(job__company=company)
+            if request.query_params.get('job'):
+                queryset = queryset.filter(job_id=int(request.query_params['job']))
+            if request.query_params.get('status'):
+                queryset = queryset.filter(status=request.query_params['status'])
+            
+            rows = queryset.order_by('id').values_list(*[EXPORT_COLUMNS[name] for name in columns])
+            rows = rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+            if 'resume' in columns:
+                resume_index = columns.index('resume')
+                media_url = request.build_absolute_uri(settings.MEDIA_URL)
+                rows = (
+                    row[:resume_index] + ((media_url + row[resume_index]) if row[resume_index] else '',) + row[resume_index + 1:]
+                    for row in rows
+                )
+            
+            stream = stream_csv(columns, rows) if export_format == 'csv' else stream_xlsx(columns, rows)
+            filename = f"applications-{timezone.localdate().isoformat()}.{export_format}"
+            response = StreamingHttpResponse(atomic_stream(stream), content_type=self.content_types[export_format])
+            response['Content-Disposition'] = f'attachment; filename="{filename}"'
+            return response
+        except ValueError:
+            return api_response(
+                errors={"job": "job must be an integer."},
+                message="Invalid export parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        except Exception as e:
+            log_error(e, "Error exporting company applications")
+            return api_response(
+                message="An unexpected error occurred while exporting applications",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+def search_text(request):
+    """The applicant search query, or None when it is missing or blank."""
+    return request.query_params.get('q', '').strip() or None
+
+
+class ApplicantSearchPagination(StandardCursorPagination):
+    """Keyset pagination by rank when searching, by recency otherwise."""
+    
+    def get_ordering(self, request, queryset, view):
+        if search_text(request):
+            return ('-rank', '-id')
+        return ('-created_at', '-id')
+
+
+class ApplicantSearchView(PaginationMixin, APIView):
+    """API endpoint for companies to search and filter their applicants."""
+    
+    permission_classes = (IsCompany,)
+    pagination_class = ApplicantSearchPagination
+    
+    def get(self, request):
+        """Search applicants by text with optional status, job and date filters."""
+        try:
+            company = request.user.company_profile
+            params = request.query_params
+            statuses = [value for value in params.get('status', '').split(',') if value]
+            job_id = int(params['job']) if params.get('job') else None
+            applied_after = date.fromisoformat(params['applied_after']) if params.get('applied_after') else None
+            applied_before = date.fromisoformat(params['applied_before']) if params.get('applied_before') else None
+        except CompanyProfile.DoesNotExist:
+            return api_response(
+                message="Company profile not found for this user",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        except ValueError:
+            return api_response(
+                errors={"query_params": "job must be an integer and dates must be YYYY-MM-DD."},
+                message="Invalid search parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            queryset = search_applications(
+                Application.objects.filter(job__company=company).select_related('job__company'),
+                q=search_text(request),
+                statuses=statuses,
+                job_id=job_id,
+                applied_after=applied_after,
+                applied_before=applied_before,
+            )
+            page = self.paginate_queryset(queryset)
+            data = ApplicationSnapshotSerializer(page, many=True).data
+            for item, application in zip(data, page):
+                item['rank'] = getattr(application, 'rank', None)
+            return get_cursor_paginated_response(
+                self.paginator,
+                data,
+                message="Applicant search results",
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            log_error(e, "Error searching applicants")
+            return api_response(
+                message="An unexpected error occurred while searching applicants",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class CompanyPipelineView(APIView):
+    """API endpoint for companies to view their hiring board grouped by job and status."""
+    
+    permission_classes = (IsCompany,)
+    default_cards_per_column = 5
+    max_cards_per_column = 50
+    
+    def get(self, request):
+        """Get per-job, per-status counts and the newest cards of each column."""
+        try:
+            company = request.user.company_profile
+            cards_per_column = int(request.query_params.get('cards', self.default_cards_per_column))
+            job_id = request.query_params.get('job')
+            job_id = int(job_id) if job_id else None
+        except CompanyProfile.DoesNotExist:
+            return api_response(
+                message="Company profile not found for this user",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        except ValueError:
+            return api_response(
+                errors={"query_params": "cards and job must be integers."},
+                message="Invalid pipeline parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            cards_per_column = max(0, min(cards_per_column, self.max_cards_per_column))
+            board = get_cached_pipeline(company, cards_per_column, job_id=job_id)
+            return api_response(
+                data=board,
+                message="Hiring pipeline retrieved successfully",
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            log_error(e, "Error retrieving hiring pipeline")
+            return api_response(
+                message="An unexpected error occurred while retrieving the hiring pipeline",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class JobApplicationsView(PaginationMixin, APIView):
     """API endpoint for companies to view applications for a specific job."""
     
@@ -126,16 +422,20 @@ class JobApplicationsView(PaginationMixin, APIView):
     pagination_class = StandardResultsSetPagination
     
     def get(self, request, job_id):
-        """Get all applications for a specific job posting."""
+        """Get all applications for a specific job posting, newest first or by ?sort=match."""
         try:
             company = request.user.company_profile
             job = get_object_or_404(Job, id=job_id, company=company)
-            queryset = Application.objects.filter(job=job)
+            queryset = recruiter_queryset(Application.objects.filter(job=job), request)
+            serializer_class = recruiter_serializer_class(request)
+            
+            if request.query_params.get('sort') == 'match':
+                return self.get_ranked(job, queryset, serializer_class)
             
             # Paginate results
             page = self.paginate_queryset(queryset)
             if page is not None:
-                serializer = ApplicationSerializer(page, many=True)
+                serializer = serializer_class(page, many=True)
                 return get_paginated_response(
                     self.paginator, 
                     serializer.data,
@@ -144,7 +444,7 @@ class JobApplicationsView(PaginationMixin, APIView):
                 )
             
             # If pagination is disabled
-            serializer = ApplicationSerializer(queryset, many=True)
+            serializer = serializer_class(queryset, many=True)
             return api_response(
                 data=serializer.data,
                 message=f"Applications for job '{job.title}' retrieved successfully",
@@ -166,6 +466,25 @@ class JobApplicationsView(PaginationMixin, APIView):
                 message="An unexpected error occurred while retrieving applications",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    def get_ranked(self, job, queryset, serializer_class):
+        """Page through applicants by cached match score, loading only the current page."""
+        scores = get_cached_scores(job)
+        page = self.paginate_queryset(scores)
+        applications = queryset.in_bulk([application_id for application_id, _ in page])
+        data = []
+        for application_id, score in page:
+            # Skip applications removed since the scores were cached
+            if application_id in applications:
+                item = serializer_class(applications[application_id]).data
+                item['match_score'] = score
+                data.append(item)
+        return get_paginated_response(
+            self.paginator,
+            data,
+            message=f"Applications for job '{job.title}' ranked by match",
+            status_code=status.HTTP_200_OK
+        )
 
 
 class ApplicationDetailView(APIView):
@@ -174,8 +493,8 @@ class ApplicationDetailView(APIView):
     permission_classes = (IsAuthenticated,)
     
     def get_object(self, pk, user):
-        """Get the application object based on user type."""
-        application = get_object_or_404(Application, pk=pk)
+        """Get the application object based on user type, reading through to the archive."""
+        application = Application.objects.filter(pk=pk).first() or get_object_or_404(ArchivedApplication, pk=pk)
         
         if user.user_type == 'jobseeker':
             # For job seekers, only allow access to their own applications
@@ -198,12 +517,23 @@ class ApplicationDetailView(APIView):
                     status_code=status.HTTP_404_NOT_FOUND
                 )
             
-            serializer = ApplicationSerializer(application)
-            return api_response(
-                data=serializer.data,
+            if request.user.user_type == 'company':
+                data = recruiter_serializer_class(request)(application).data
+            else:
+                data = ApplicationSerializer(application).data
+            if isinstance(application, ArchivedApplication):
+                data['archived'] = True
+                data['archived_at'] = application.archived_at
+                data['history'] = application.history
+                data['timeline'] = archived_timeline(application.pk)
+            response = api_response(
+                data=data,
                 message="Application details retrieved successfully",
                 status_code=status.HTTP_200_OK
             )
+            if isinstance(application, Application):
+                response['ETag'] = etag_for_version(application.version)
+            return response
         except Application.DoesNotExist:
             return api_response(
                 message="Application not found",
@@ -232,10 +562,16 @@ class ApplyForJobView(APIView):
             )
             
             if serializer.is_valid():
-                application = serializer.save(jobseeker=jobseeker)
+                if settings.APPLY_QUEUE_MODE:
+                    return self.enqueue(request, jobseeker, serializer.validated_data)
+                application = serializer.save(
+                    jobseeker=jobseeker,
+                    candidate_snapshot=build_candidate_snapshot(jobseeker)
+                )
                 # Create timeline event for application submission
                 ApplicationTimeline.objects.create(
                     application=application,
+                    user=request.user,
                     event_type='submitted',
                     event_date=timezone.now(),
                     notes='Application submitted by job seeker.'
@@ -271,6 +607,138 @@ class ApplyForJobView(APIView):
                 message="An unexpected error occurred while submitting your application",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+    
+    def enqueue(self, request, jobseeker, validated_data):
+        """Store the resume and queue the application for the apply worker; answer 202."""
+        queued = QueuedApplication.objects.create(
+            jobseeker=jobseeker,
+            job=validated_data['job'],
+            cover_letter=validated_data.get('cover_letter', ''),
+            resume=validated_data.get('resume'),
+        )
+        data = QueuedApplicationSerializer(queued).data
+        data['status_url'] = request.build_absolute_uri(
+            reverse('queued_application_status', args=[queued.tracking_id])
+        )
+        return api_response(
+            data=data,
+            message="Application received and queued for processing",
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
+
+class QueuedApplicationStatusView(APIView):
+    """API endpoint for job seekers to follow an application submitted in queued apply mode."""
+    
+    permission_classes = (IsJobseeker,)
+    
+    def get(self, request, tracking_id):
+        """Get the outcome of a queued application, with the application once accepted."""
+        try:
+            queued = QueuedApplication.objects.select_related('job', 'application__job__company').filter(
+                tracking_id=tracking_id, jobseeker__user=request.user
+            ).first()
+            if queued is None:
+                return api_response(
+                    message="Queued application not found",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            data = QueuedApplicationSerializer(queued).data
+            if queued.application is not None:
+                data['application'] = ApplicationSerializer(queued.application).data
+            return api_response(
+                data=data,
+                message=f"Application is {queued.status}",
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            log_error(e, "Error retrieving queued application status")
+            return api_response(
+                message="An unexpected error occurred while retrieving the application status",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class BatchApplyForJobsView(APIView):
+    """API endpoint for job seekers to apply to several jobs with one upload."""
+    
+    permission_classes = (IsJobseeker,)
+    
+    def post(self, request):
+        """Create one application per job, sharing a single stored resume."""
+        try:
+            jobseeker = request.user.jobseeker_profile
+            serializer = BatchApplicationCreateSerializer(
+                data=request.data,
+                context={'request': request, 'jobseeker': jobseeker}
+            )
+            if not serializer.is_valid():
+                return api_response(
+                    errors=serializer.errors,
+                    message="Batch application failed",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            jobs = serializer.validated_data['jobs']
+            cover_letter = serializer.validated_data.get('cover_letter', '')
+            resume = serializer.validated_data.get('resume')
+            
+            # Store the resume once; every application points at the same file
+            resume_name = None
+            if resume:
+                resume_field = Application._meta.get_field('resume')
+                resume_name = resume_field.storage.save(resume_field.generate_filename(None, resume.name), resume)
+            
+            try:
+                snapshot = build_candidate_snapshot(jobseeker)
+                with transaction.atomic():
+                    applications = Application.objects.bulk_create([
+                        Application(
+                            jobseeker=jobseeker, job=job, cover_letter=cover_letter,
+                            resume=resume_name, candidate_snapshot=snapshot
+                        )
+                        for job in jobs
+                    ])
+                    now = timezone.now()
+                    events = ApplicationTimeline.objects.bulk_create([
+                        ApplicationTimeline(
+                            application=application,
+                            user_id=jobseeker.user_id,
+                            event_type='submitted',
+                            event_date=now,
+                            notes='Application submitted by job seeker.'
+                        )
+                        for application in applications
+                    ])
+                    record_timeline_events(events)
+            except IntegrityError:
+                return api_response(
+                    message="You have already applied to one of these jobs",
+                    status_code=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # bulk_create skips post_save
+            index_new_applications(applications, jobs)
+            
+            created = Application.objects.filter(
+                pk__in=[application.pk for application in applications]
+            ).select_related('jobseeker__user', 'job__company')
+            return api_response(
+                data=ApplicationSerializer(created, many=True).data,
+                message=f"Applied to {len(applications)} jobs successfully",
+                status_code=status.HTTP_201_CREATED
+            )
+        except JobSeekerProfile.DoesNotExist:
+            return api_response(
+                message="Job seeker profile not found for this user",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            log_error(e, "Error applying for jobs in batch")
+            return api_response(
+                message="An unexpected error occurred while submitting your applications",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
 
 class UpdateApplicationStatusView(APIView):
@@ -289,12 +757,21 @@ class UpdateApplicationStatusView(APIView):
             )
             
             if serializer.is_valid():
+                if not claim_version(application, expected_version(request, application)):
+                    return precondition_failed_response(
+                        application, "Application was changed by someone else; reload it and try again"
+                    )
+                previous_status = application.status
                 application = serializer.save()
-                return api_response(
-                    data=ApplicationSerializer(application).data,
+                if application.status != previous_status:
+                    notify_status_change(application, previous_status)
+                response = api_response(
+                    data=ApplicationSnapshotSerializer(application).data,
                     message="Application status updated successfully",
                     status_code=status.HTTP_200_OK
                 )
+                response['ETag'] = etag_for_version(application.version)
+                return response
             return api_response(
                 errors=serializer.errors,
                 message="Application status update failed",
@@ -328,31 +805,26 @@ class ApplicationNotesView(PaginationMixin, APIView):
     """API endpoint for managing application notes."""
     
     permission_classes = (IsCompany,)
-    pagination_class = StandardResultsSetPagination
+    pagination_class = StandardCursorPagination
     
-    def post(self, request, application_id):
+    def get(self, request, application_id):
+        """Get the notes of an application, newest first."""
         try:
             company = request.user.company_profile
             application = get_object_or_404(
                 Application, pk=application_id, job__company=company
             )
             
-            serializer = ApplicationNoteSerializer(data={
-                'application': application.id,
-                'text': request.data.get('text')
-            })
+            queryset = ApplicationNote.objects.filter(application=application).select_related('created_by')
             
-            if serializer.is_valid():
-                note = serializer.save(created_by=request.user)  # Add created_by
-                return api_response(
-                    data=ApplicationNoteSerializer(note).data,
-                    message="Note added successfully",
-                    status_code=status.HTTP_201_CREATED
-                )
-            return api_response(
-                errors=serializer.errors,
-                message="Note creation failed",
-                status_code=status.HTTP_400_BAD_REQUEST
+            # Keyset pagination over the (application, created_at) index
+            page = self.paginate_queryset(queryset)
+            serializer = ApplicationNoteSerializer(page, many=True)
+            return get_cursor_paginated_response(
+                self.paginator,
+                serializer.data,
+                message="Notes retrieved successfully",
+                status_code=status.HTTP_200_OK
             )
         except CompanyProfile.DoesNotExist:
             return api_response(
@@ -385,7 +857,7 @@ class ApplicationNotesView(PaginationMixin, APIView):
             })
             
             if serializer.is_valid():
-                note = serializer.save()
+                note = serializer.save(created_by=request.user)
                 return api_response(
                     data=ApplicationNoteSerializer(note).data,
                     message="Note added successfully",
@@ -414,6 +886,67 @@ class ApplicationNotesView(PaginationMixin, APIView):
             )
 
 
+class LatestApplicationNotesView(APIView):
+    """API endpoint for companies to fetch the latest notes of many applications at once."""
+    
+    permission_classes = (IsCompany,)
+    max_applications = 100
+    max_notes_per_application = 10
+    
+    def get(self, request):
+        """Get the newest notes for each application id in ``?ids=1,2,3``."""
+        try:
+            company = request.user.company_profile
+            ids = [int(pk) for pk in request.query_params.get('ids', '').split(',') if pk.strip()]
+            per_application = int(request.query_params.get('per_application', 1))
+        except CompanyProfile.DoesNotExist:
+            return api_response(
+                message="Company profile not found for this user",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        except ValueError:
+            return api_response(
+                errors={"query_params": "ids must be a comma separated list of integers."},
+                message="Invalid notes parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not ids or len(ids) > self.max_applications:
+            return api_response(
+                errors={"ids": f"Provide between 1 and {self.max_applications} application ids."},
+                message="Invalid notes parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            per_application = max(1, min(per_application, self.max_notes_per_application))
+            # One ROW_NUMBER() pass instead of one request per applicant row
+            notes = ApplicationNote.objects.filter(
+                application_id__in=ids, application__job__company=company
+            ).annotate(
+                position=Window(
+                    RowNumber(),
+                    partition_by=[F('application_id')],
+                    order_by=F('created_at').desc(),
+                )
+            ).filter(position__lte=per_application).select_related('created_by').order_by('application_id', 'position')
+            
+            latest = {str(pk): [] for pk in ids}
+            for note in notes:
+                latest[str(note.application_id)].append(ApplicationNoteSerializer(note).data)
+            return api_response(
+                data=latest,
+                message="Latest notes retrieved successfully",
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            log_error(e, "Error retrieving latest application notes")
+            return api_response(
+                message="An unexpected error occurred while retrieving application notes",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class InterviewsView(PaginationMixin, APIView):
     """API endpoint for managing interviews."""
     
@@ -478,7 +1011,15 @@ class InterviewsView(PaginationMixin, APIView):
             
             serializer = InterviewSerializer(data=data)
             if serializer.is_valid():
+                conflict = interview_conflict_response(
+                    company,
+                    serializer.validated_data['scheduled_at'],
+                    serializer.validated_data.get('duration', 60)
+                )
+                if conflict:
+                    return conflict
                 interview = serializer.save()
+                notify_interview(interview, 'interview_scheduled')
                 return api_response(
                     data=InterviewSerializer(interview).data,
                     message="Interview scheduled successfully",
@@ -513,6 +1054,62 @@ class InterviewsView(PaginationMixin, APIView):
             )
 
 
+class InterviewAvailabilityView(APIView):
+    """API endpoint for companies to find free interview slots."""
+    
+    permission_classes = (IsCompany,)
+    max_range_days = 31
+    
+    def get(self, request):
+        """Get free windows per day for the authenticated company."""
+        try:
+            company = request.user.company_profile
+            params = request.query_params
+            start_date = date.fromisoformat(params['start_date']) if params.get('start_date') else timezone.localdate()
+            end_date = date.fromisoformat(params['end_date']) if params.get('end_date') else start_date + timedelta(days=6)
+            day_start = datetime.strptime(params.get('day_start', '09:00'), '%H:%M').time()
+            day_end = datetime.strptime(params.get('day_end', '17:00'), '%H:%M').time()
+            duration = int(params.get('duration', 60))
+        except CompanyProfile.DoesNotExist:
+            return api_response(
+                message="Company profile not found for this user",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        except ValueError as e:
+            return api_response(
+                errors={"query_params": str(e)},
+                message="Invalid availability parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if end_date < start_date or (end_date - start_date).days >= self.max_range_days:
+            return api_response(
+                errors={"end_date": f"Range must be between 1 and {self.max_range_days} days."},
+                message="Invalid availability parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        if day_end <= day_start or not 15 <= duration <= 240:
+            return api_response(
+                errors={"query_params": "day_end must be after day_start and duration between 15 and 240 minutes."},
+                message="Invalid availability parameters",
+                status_code=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            days = free_windows(company, start_date, end_date, day_start, day_end, duration)
+            return api_response(
+                data=days,
+                message="Available interview slots retrieved successfully",
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            log_error(e, "Error computing interview availability")
+            return api_response(
+                message="An unexpected error occurred while computing availability",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class InterviewDetailView(APIView):
     """API endpoint for managing a specific interview."""
     
@@ -532,11 +1129,13 @@ class InterviewDetailView(APIView):
             )
             
             serializer = InterviewSerializer(interview)
-            return api_response(
+            response = api_response(
                 data=serializer.data,
                 message="Interview details retrieved successfully",
                 status_code=status.HTTP_200_OK
             )
+            response['ETag'] = etag_for_version(interview.version)
+            return response
         except CompanyProfile.DoesNotExist:
             return api_response(
                 message="Company profile not found for this user",
@@ -564,12 +1163,27 @@ class InterviewDetailView(APIView):
             
             serializer = InterviewSerializer(interview, data=request.data, partial=True)
             if serializer.is_valid():
+                conflict = interview_conflict_response(
+                    company,
+                    serializer.validated_data.get('scheduled_at', interview.scheduled_at),
+                    serializer.validated_data.get('duration', interview.duration),
+                    exclude_pk=interview.pk
+                )
+                if conflict:
+                    return conflict
+                if not claim_version(interview, expected_version(request, interview)):
+                    return precondition_failed_response(
+                        interview, "Interview was changed by someone else; reload it and try again"
+                    )
                 updated_interview = serializer.save()
-                return api_response(
+                notify_interview(updated_interview, 'interview_updated')
+                response = api_response(
                     data=InterviewSerializer(updated_interview).data,
                     message="Interview updated successfully",
                     status_code=status.HTTP_200_OK
                 )
+                response['ETag'] = etag_for_version(updated_interview.version)
+                return response
             return api_response(
                 errors=serializer.errors,
                 message="Interview update failed",
@@ -606,6 +1220,7 @@ class InterviewDetailView(APIView):
                 Interview, pk=pk, application__job__company=company
             )
             
+            notify_interview(interview, 'interview_cancelled')
             interview.delete()
             return api_response(
                 message="Interview deleted successfully",
@@ -626,4 +1241,77 @@ class InterviewDetailView(APIView):
             return api_response(
                 message="An unexpected error occurred while deleting the interview",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class CalendarFeedView(APIView):
+    """API endpoint for managing the authenticated user's interview calendar feed."""
+    
+    permission_classes = (IsAuthenticated,)
+    
+    def _feed_data(self, request, feed):
+        url = request.build_absolute_uri(reverse('calendar_feed_ics', args=[feed.token]))
+        return {'token': feed.token, 'url': url, 'created_at': feed.created_at}
+    
+    def get(self, request):
+        """Get (creating on first use) the calendar feed URL."""
+        try:
+            feed, _ = CalendarFeed.objects.get_or_create(user=request.user)
+            return api_response(
+                data=self._feed_data(request, feed),
+                message="Calendar feed retrieved successfully",
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            log_error(e, "Error retrieving calendar feed")
+            return api_response(
+                message="An unexpected error occurred while retrieving the calendar feed",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    def post(self, request):
+        """Rotate the feed token, revoking the previous URL."""
+        try:
+            feed, created = CalendarFeed.objects.get_or_create(user=request.user)
+            if not created:
+                # Cached feeds are served by token without a database check, so the old one is purged by name
+                revoke_feed(feed.token)
+                feed.token = CalendarFeed._meta.get_field('token').get_default()
+                feed.save(update_fields=['token'])
+            return api_response(
+                data=self._feed_data(request, feed),
+                message="Calendar feed URL rotated successfully",
+                status_code=status.HTTP_200_OK
+            )
+        except Exception as e:
+            log_error(e, "Error rotating calendar feed")
+            return api_response(
+                message="An unexpected error occurred while rotating the calendar feed",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class CalendarFeedICSView(APIView):
+    """Public iCalendar feed of upcoming interviews, authenticated by its token."""
+    
+    authentication_classes = ()
+    permission_classes = (AllowAny,)
+    
+    def get(self, request, token):
+        """Serve the cached feed, answering 304 when the client copy is current."""
+        try:
+            feed = get_cached_feed(token)
+            if feed is None:
+                return HttpResponse("Calendar feed not found", status=status.HTTP_404_NOT_FOUND, content_type='text/plain')
+            
+            body, etag = feed
+            if etag in request.headers.get('If-None-Match', ''):
+                response = HttpResponseNotModified()
+            else:
+                response = HttpResponse(body, content_type='text/calendar; charset=utf-8')
+            response['ETag'] = etag
+            response['Cache-Control'] = 'private, max-age=300'
+            return response
+        except Exception as e:
+            log_error(e, "Error serving calendar feed")
+            return HttpResponse(status=status.HTTP_500_INTERNAL_SERVER_ERROR)
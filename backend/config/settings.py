@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     
     # Third-party apps
     'rest_framework',
@@ -50,6 +51,7 @@ INSTALLED_APPS = [
     'jobs',
     'applications',
     'analytics',
+    'notifications',
 ]
 
 MIDDLEWARE = [
@@ -101,6 +103,36 @@ DATABASES = {
     }
 }
 
+# Cache
+# File-based by default so all workers on a host share entries and invalidations;
+# point CACHE_BACKEND/CACHE_LOCATION at Redis or Memcached for multi-host deployments.
+CACHES = {
+    'default': {
+        'BACKEND': get_env_variable('CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': get_env_variable('CACHE_LOCATION', os.path.join(BASE_DIR, 'cache')),
+        'TIMEOUT': 60 * 60,
+    }
+}
+
+# Applications of closed jobs older than this are moved to the archive tables
+# by `manage.py archive_applications`
+APPLICATION_ARCHIVE_AFTER_DAYS = int(get_env_variable('APPLICATION_ARCHIVE_AFTER_DAYS', '365'))
+
+# Queued apply mode: applications are stored with their resume and answered with
+# 202, then committed in batches by `manage.py run_apply_worker`. Turn on for
+# burst traffic, e.g. when a popular posting goes out.
+APPLY_QUEUE_MODE = get_env_variable('APPLY_QUEUE_MODE', 'False').lower() in ('true', 't', '1', 'yes')
+
+# Notifications
+# Outbox messages are delivered by `manage.py run_outbox_worker` through these channels
+NOTIFICATION_CHANNELS = [
+    'notifications.channels.EmailFileChannel',
+    'notifications.channels.WebhookChannel',
+]
+NOTIFICATION_EMAIL_DIR = get_env_variable('NOTIFICATION_EMAIL_DIR', os.path.join(BASE_DIR, 'sent_emails'))
+NOTIFICATION_WEBHOOK_URL = get_env_variable('NOTIFICATION_WEBHOOK_URL', '')  # e.g. http://localhost:9000/hooks/
+DEFAULT_FROM_EMAIL = get_env_variable('DEFAULT_FROM_EMAIL', 'no-reply@job-application-tracker.local')
+
 # Custom user model
 AUTH_USER_MODEL = 'users.User'
 
@@ -134,6 +166,12 @@ STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Hash uploads while they stream in so resume storage can deduplicate without re-reading them
+FILE_UPLOAD_HANDLERS = [
+    'users.uploadhandlers.HashingMemoryFileUploadHandler',
+    'users.uploadhandlers.HashingTemporaryFileUploadHandler',
+]
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -191,12 +229,13 @@ CORS_ALLOW_HEADERS = [
     'authorization',
     'content-type',
     'dnt',
+    'if-match',
     'origin',
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
 ]
-CORS_EXPOSE_HEADERS = ['Content-Type', 'X-CSRFToken']
+CORS_EXPOSE_HEADERS = ['Content-Type', 'X-CSRFToken', 'ETag']
 CORS_PREFLIGHT_MAX_AGE = 86400  # 24 hours
 
 # Logging configuration
@@ -3,9 +3,12 @@
 from rest_framework.response import Response
 import traceback
 import logging
-from rest_framework.pagination import PageNumberPagination
+import time
+from rest_framework.pagination import PageNumberPagination, CursorPagination
 from rest_framework.response import Response
 from collections import OrderedDict
+from django.core.cache import cache
+from django.db import transaction
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +41,129 @@ def api_response(data=None, message=None, status_code=200, errors=None):
     
     return Response(response_data, status=status_code)
 
+def bump_version(instance, save_kwargs):
+    """
+    Increment the ``version`` of a model instance that is about to be saved.
+    
+    Args:
+        instance: A model instance with a ``version`` field
+        save_kwargs: The keyword arguments of the pending save(); ``update_fields`` gains ``version``
+    """
+    if instance._state.adding:
+        return
+    instance.version += 1
+    update_fields = save_kwargs.get('update_fields')
+    if update_fields is not None:
+        save_kwargs['update_fields'] = set(update_fields) | {'version'}
+
+
+def claim_version(instance, expected_version):
+    """
+    Conditionally take the next version of a row: ``UPDATE ... WHERE version = expected``.
+    
+    The UPDATE only matches if nobody saved the row since the client read it, so
+    no lock is held while the request is validated. On success the following
+    save() writes the same, already claimed, version.
+    
+    Args:
+        instance: A model instance with a ``version`` field
+        expected_version: The version the client last saw
+    
+    Returns:
+        True if the version was claimed, False if the row changed in the meantime
+    """
+    claimed = type(instance)._default_manager.filter(
+        pk=instance.pk, version=expected_version
+    ).update(version=expected_version + 1)
+    if claimed:
+        instance.version = expected_version
+    return bool(claimed)
+
+
+def etag_for_version(version):
+    return f'"{version}"'
+
+
+def if_match_version(request):
+    """
+    Parse the version from a request's If-Match header.
+    
+    Returns:
+        The version as an integer, None if the header is absent or "*", or -1 if it is malformed
+    """
+    header = request.headers.get('If-Match', '').strip()
+    if not header or header == '*':
+        return None
+    try:
+        return int(header.removeprefix('W/').strip('"'))
+    except ValueError:
+        return -1
+
+
+def precondition_failed_response(instance, message):
+    """Return a 412 carrying the current version so the client can reload and retry."""
+    instance.refresh_from_db(fields=['version'])
+    response = api_response(
+        errors={"version": instance.version},
+        message=message,
+        status_code=412
+    )
+    response['ETag'] = etag_for_version(instance.version)
+    return response
+
+
+def cache_version(scope):
+    """
+    Get the current version of a cache scope.
+    
+    A missing version is seeded from the clock rather than 1. Version keys can
+    be culled like any other entry, and a seed above every earlier version
+    (bumps only add one at a time) means entries written under a lost version
+    are never served again.
+    
+    Args:
+        scope: Name of a group of cache entries, e.g. "pipeline:42"
+    
+    Returns:
+        An integer to pass as ``version`` to cache reads and writes
+    """
+    return cache.get_or_set(f"cache_version:{scope}", time.time_ns, None)
+
+
+def bump_cache_version(scope):
+    """
+    Invalidate every entry of a cache scope once the current transaction commits.
+    
+    Args:
+        scope: Name of a group of cache entries, e.g. "pipeline:42"
+    """
+    key = f"cache_version:{scope}"
+    
+    def _bump():
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    
+    transaction.on_commit(_bump)
+
+
+def atomic_stream(chunks):
+    """
+    Consume a streaming response body inside its own transaction.
+    
+    StreamingHttpResponse bodies are read after the ATOMIC_REQUESTS transaction
+    has ended. Outside a transaction Django declares server-side cursors WITH
+    HOLD, which PostgreSQL materialises in full before returning the first row;
+    inside one the cursor streams rows as the query produces them.
+    
+    Args:
+        chunks: A lazy iterable whose queries have not started yet
+    """
+    with transaction.atomic():
+        yield from chunks
+
+
 def log_error(error, message=None):
     """
     Log an error with detailed traceback.
@@ -67,6 +193,15 @@ class StandardResultsSetPagination(PageNumberPagination):
         ]))
 
 
+class StandardCursorPagination(CursorPagination):
+    """Keyset pagination for feeds that grow at the head; cost does not depend on page depth."""
+    
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = '-created_at'
+
+
 def get_paginated_response(paginator, data, message="", status_code=200, errors=None):
     """
     Return paginated response in standard format.
@@ -98,6 +233,36 @@ def get_paginated_response(paginator, data, message="", status_code=200, errors=
     
     return Response(response_data, status=status_code)
 
+def get_cursor_paginated_response(paginator, data, message="", status_code=200, errors=None):
+    """
+    Return cursor paginated response in standard format.
+    
+    Args:
+        paginator: The cursor pagination instance
+        data: The paginated data
+        message: Optional message
+        status_code: HTTP status code
+        errors: Any error details
+        
+    Returns:
+        A consistent REST framework Response with next/previous cursors
+    """
+    response_data = {
+        "status": "success" if status_code < 400 else "error",
+        "message": message,
+        "data": OrderedDict([
+            ('next', paginator.get_next_link()),
+            ('previous', paginator.get_previous_link()),
+            ('results', data)
+        ])
+    }
+    
+    # Add errors if provided
+    if errors:
+        response_data["errors"] = errors
+    
+    return Response(response_data, status=status_code)
+
 # Add to config/utils.py
 class PaginationMixin:
     """Mixin that adds pagination functionality to APIView."""
@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     JobListView, JobSearchView, JobDetailView,
-    CompanyJobsView, JobCreateView, JobUpdateView
+    CompanyJobsView, CompanyJobAnalyticsView, JobCreateView, JobUpdateView
 )
 from rest_framework.routers import DefaultRouter
 
@@ -13,6 +13,7 @@ urlpatterns = [
     
     # Company job management endpoints
     path('company/', CompanyJobsView.as_view(), name='company_jobs'),
+    path('company/<int:pk>/analytics/', CompanyJobAnalyticsView.as_view(), name='company_job_analytics'),
     path('create/', JobCreateView.as_view(), name='job_create'),
     path('<int:pk>/update/', JobUpdateView.as_view(), name='job_update'),
 ]
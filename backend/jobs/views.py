@@ -13,6 +13,7 @@ from rest_framework import viewsets
 from .models import Job, JobSkill
 from .serializers import JobSerializer, JobDetailSerializer, JobCreateUpdateSerializer
 from users.models import Skill, CompanyProfile
+from analytics.job_stats import job_summary
 
 
 class IsCompany(permissions.BasePermission):
@@ -205,6 +206,39 @@ class CompanyJobsView(PaginationMixin, APIView):
             )
 
 
+class CompanyJobAnalyticsView(APIView):
+    """API endpoint for company to view the analytics of one of their job postings."""
+    
+    permission_classes = (IsCompany,)
+    
+    def get(self, request, pk):
+        """Get applicants per day, status distribution and time-to-review/hire of a job."""
+        try:
+            company_profile = request.user.company_profile
+            job = Job.objects.filter(pk=pk, company=company_profile).first()
+            if job is None:
+                return api_response(
+                    message="Job not found or you don't have permission to view it",
+                    status_code=status.HTTP_404_NOT_FOUND
+                )
+            return api_response(
+                data=job_summary(job),
+                message="Job analytics retrieved successfully",
+                status_code=status.HTTP_200_OK
+            )
+        except CompanyProfile.DoesNotExist:
+            return api_response(
+                message="Company profile not found for this user",
+                status_code=status.HTTP_404_NOT_FOUND
+            )
+        except Exception as e:
+            log_error(e, "Error retrieving job analytics")
+            return api_response(
+                message="An unexpected error occurred while retrieving job analytics",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class JobCreateView(APIView):
     """API endpoint for company to create a new job posting."""
     
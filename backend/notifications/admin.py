@@ -0,0 +1,12 @@
+from django.contrib import admin
+from .models import OutboxMessage
+
+
+@admin.register(OutboxMessage)
+class OutboxMessageAdmin(admin.ModelAdmin):
+    """Admin for OutboxMessage model."""
+    
+    list_display = ('event_type', 'recipient', 'status', 'attempts', 'created_at', 'processed_at')
+    search_fields = ('recipient__email', 'subject')
+    list_filter = ('status', 'event_type')
+    date_hierarchy = 'created_at'
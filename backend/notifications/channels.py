@@ -0,0 +1,83 @@
+# notifications/channels.py
+import json
+import os
+import urllib.request
+
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+class BaseChannel:
+    """
+    A delivery channel for outbox messages.
+    
+    Channels receive the message id as an idempotency key, so a message
+    redelivered after a worker crash must not be shown twice to the user.
+    """
+    
+    name = None
+    
+    def is_enabled(self):
+        return True
+    
+    def deliver(self, message):
+        raise NotImplementedError
+
+
+class EmailFileChannel(BaseChannel):
+    """Stand-in for an email provider: writes one .eml file per message."""
+    
+    name = 'email_file'
+    
+    def deliver(self, message):
+        directory = settings.NOTIFICATION_EMAIL_DIR
+        os.makedirs(directory, exist_ok=True)
+        email = EmailMessage(
+            subject=message.subject,
+            body=message.body,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[message.recipient.email],
+            headers={'X-Outbox-Message-Id': str(message.pk)},
+        )
+        # Named by message id, so a redelivery overwrites instead of duplicating
+        path = os.path.join(directory, f"{message.pk}.eml")
+        with open(path + '.tmp', 'wb') as handle:
+            handle.write(email.message().as_bytes())
+        os.replace(path + '.tmp', path)
+
+
+class WebhookChannel(BaseChannel):
+    """Stand-in for a push provider: POSTs the message as JSON to a local endpoint."""
+    
+    name = 'webhook'
+    timeout = 5
+    
+    def is_enabled(self):
+        return bool(settings.NOTIFICATION_WEBHOOK_URL)
+    
+    def deliver(self, message):
+        body = json.dumps({
+            'id': message.pk,
+            'event_type': message.event_type,
+            'recipient': message.recipient_id,
+            'subject': message.subject,
+            'body': message.body,
+            'payload': message.payload,
+            'created_at': message.created_at,
+        }, cls=DjangoJSONEncoder).encode('utf-8')
+        request = urllib.request.Request(
+            settings.NOTIFICATION_WEBHOOK_URL,
+            data=body,
+            method='POST',
+            headers={'Content-Type': 'application/json', 'Idempotency-Key': f"outbox-{message.pk}"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            response.read()
+
+
+def get_channels():
+    """Instantiate the enabled channels listed in NOTIFICATION_CHANNELS."""
+    channels = [import_string(path)() for path in settings.NOTIFICATION_CHANNELS]
+    return [channel for channel in channels if channel.is_enabled()]
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from notifications.outbox import run_worker
+
+
+class Command(BaseCommand):
+    help = "Deliver pending outbox notifications in batches until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=100)
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once the outbox is drained instead of polling.")
+
+    def handle(self, *args, **options):
+        total = run_worker(
+            batch_size=options['batch_size'],
+            poll_interval=options['poll_interval'],
+            once=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} outbox messages."))
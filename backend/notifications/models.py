@@ -0,0 +1,36 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class OutboxMessage(models.Model):
+    """Notification written in the same transaction as the change it announces."""
+    
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('delivered', 'Delivered'),
+        ('failed', 'Failed'),
+    ]
+    
+    event_type = models.CharField(max_length=50)  # e.g. 'application_status_changed', 'interview_scheduled'
+    recipient = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='outbox_messages')
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    payload = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    # Channels that already accepted the message, so retries never repeat them
+    delivered_channels = models.JSONField(default=list)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    available_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['status', 'available_at'], name='outbox_status_available_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.event_type} for {self.recipient_id} ({self.status})"
@@ -0,0 +1,157 @@
+# notifications/outbox.py
+import logging
+import signal
+import time
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .channels import get_channels
+from .models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 8
+# A claimed message is hidden from other workers this long; a crashed worker's claim lapses after it
+CLAIM_TIMEOUT = timedelta(minutes=15)
+
+
+def enqueue(event_type, recipient, subject, body, payload=None):
+    """
+    Record a notification in the outbox.
+    
+    Called inside the request transaction, so the message is committed if and
+    only if the change it describes is committed. Delivery happens later in
+    the outbox worker and never adds latency to the request.
+    """
+    return OutboxMessage.objects.create(
+        event_type=event_type,
+        recipient=recipient,
+        subject=subject,
+        body=body,
+        payload=payload or {},
+    )
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=min(2 ** attempts * 5, 60 * 60))
+
+
+def deliver_message(message, channels):
+    """
+    Send a message through every channel that has not accepted it yet.
+    
+    Runs outside any transaction: each accepted channel is recorded in its
+    own autocommit UPDATE straight away, and no transaction is open while a
+    channel talks to its provider. The attempt itself was counted when the
+    message was claimed.
+    """
+    errors = []
+    for channel in channels:
+        if channel.name in message.delivered_channels:
+            continue
+        try:
+            channel.deliver(message)
+        except Exception as e:
+            logger.warning("Outbox message %s failed on %s: %s", message.pk, channel.name, e)
+            errors.append(f"{channel.name}: {e}")
+            continue
+        message.delivered_channels.append(channel.name)
+        # Recorded at once, so a crash before the final save never repeats this channel
+        OutboxMessage.objects.filter(pk=message.pk).update(delivered_channels=message.delivered_channels)
+    
+    if not errors:
+        message.status = 'delivered'
+        message.processed_at = timezone.now()
+        message.last_error = ''
+    elif message.attempts >= MAX_ATTEMPTS:
+        message.status = 'failed'
+        message.processed_at = timezone.now()
+        message.last_error = '\n'.join(errors)
+    else:
+        message.available_at = timezone.now() + _retry_delay(message.attempts)
+        message.last_error = '\n'.join(errors)
+    message.save(update_fields=['status', 'last_error', 'available_at', 'processed_at'])
+
+
+def claim_batch(batch_size=100):
+    """
+    Claim due messages for this worker.
+    
+    Rows are picked with SELECT ... FOR UPDATE SKIP LOCKED, their attempts
+    counted and their available_at pushed CLAIM_TIMEOUT ahead, then the claim
+    commits, so no lock is held while messages are delivered. Counting at
+    claim time means a message whose delivery crashes the worker still uses
+    up its attempts; one claimed MAX_ATTEMPTS times already is marked failed
+    instead of being handed out again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.filter(status='pending', available_at__lte=now)
+            .select_for_update(skip_locked=True, of=('self',))
+            .select_related('recipient')
+            .order_by('id')[:batch_size]
+        )
+        exhausted = [message.pk for message in messages if message.attempts >= MAX_ATTEMPTS]
+        OutboxMessage.objects.filter(pk__in=exhausted).update(
+            status='failed',
+            processed_at=now,
+            last_error="Delivery did not finish within the claim timeout",
+        )
+        messages = [message for message in messages if message.attempts < MAX_ATTEMPTS]
+        OutboxMessage.objects.filter(pk__in=[message.pk for message in messages]).update(
+            available_at=now + CLAIM_TIMEOUT, attempts=F('attempts') + 1
+        )
+    for message in messages:
+        message.attempts += 1
+    return messages
+
+
+def process_batch(batch_size=100, channels=None):
+    """
+    Claim and deliver one batch of due messages.
+    
+    Several workers can drain the outbox concurrently. Each channel's outcome
+    is committed as soon as it is known, so a failure or a crash affects only
+    the channel in flight: the claim lapses after CLAIM_TIMEOUT and the
+    message is retried, skipping the channels already recorded as delivered.
+    Channels use the message id as an idempotency key for the one that was
+    in progress.
+    
+    Returns:
+        The number of messages processed
+    """
+    channels = get_channels() if channels is None else channels
+    messages = claim_batch(batch_size)
+    for message in messages:
+        try:
+            deliver_message(message, channels)
+        except Exception:
+            logger.exception("Outbox message %s could not be processed", message.pk)
+    return len(messages)
+
+
+def run_worker(batch_size=100, poll_interval=2.0, once=False):
+    """Drain the outbox until interrupted, sleeping while it is empty."""
+    stopping = []
+    
+    def _stop(signum, frame):
+        logger.info("Outbox worker stopping after the current batch")
+        stopping.append(signum)
+    
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    
+    channels = get_channels()
+    total = 0
+    while not stopping:
+        processed = process_batch(batch_size, channels)
+        total += processed
+        if once and not processed:
+            break
+        if not processed:
+            time.sleep(poll_interval)
+    return total
@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
 from .models import (
     User, JobSeekerProfile, CompanyProfile, Skill, 
-    JobSeekerSkill, Education, Experience, SocialLink
+    JobSeekerSkill, Education, Experience, SocialLink, ResumeBlob
 )
 
 @admin.register(User)
@@ -92,4 +92,13 @@ class SocialLinkAdmin(admin.ModelAdmin):
     
     list_display = ('user', 'platform', 'url')
     search_fields = ('user__email',)
-    list_filter = ('platform',)
\ No newline at end of file
+    list_filter = ('platform',)
+
+
+@admin.register(ResumeBlob)
+class ResumeBlobAdmin(admin.ModelAdmin):
+    """Admin for ResumeBlob model."""
+    
+    list_display = ('name', 'size', 'ref_count', 'created_at')
+    search_fields = ('sha256', 'name')
+    readonly_fields = ('sha256', 'name', 'size', 'ref_count', 'created_at')
\ No newline at end of file
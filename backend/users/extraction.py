@@ -0,0 +1,83 @@
+# users/extraction.py
+"""
+Plain-text extraction for resume files.
+
+Everything here is free of Django state so it can run inside process-pool
+workers; the caller passes file paths in and stores the returned text.
+"""
+import os
+import re
+import shutil
+import subprocess
+import zipfile
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+except ImportError:  # pypdf not installed, PDF resumes will be marked unsupported
+    PdfReader = None
+
+MAX_TEXT_LENGTH = 200_000
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
+class UnsupportedResume(Exception):
+    """The file type cannot be extracted in this environment."""
+
+
+def normalize_text(text):
+    """Collapse whitespace and drop control characters, capping the stored length."""
+    text = text.replace('\x00', ' ')
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    text = re.sub(r'\s*\n\s*', '\n', text)
+    return text.strip()[:MAX_TEXT_LENGTH]
+
+
+def _extract_pdf(path):
+    if PdfReader is None:
+        raise UnsupportedResume("pypdf is not installed")
+    reader = PdfReader(path)
+    return '\n'.join(page.extract_text() or '' for page in reader.pages)
+
+
+def _extract_docx(path):
+    with zipfile.ZipFile(path) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NAMESPACE}p'):
+        paragraphs.append(''.join(node.text or '' for node in paragraph.iter(f'{WORD_NAMESPACE}t')))
+    return '\n'.join(paragraphs)
+
+
+def _extract_doc(path):
+    antiword = shutil.which('antiword')
+    if antiword is None:
+        raise UnsupportedResume("antiword is not installed")
+    result = subprocess.run([antiword, path], capture_output=True, timeout=60, check=True)
+    return result.stdout.decode('utf-8', errors='replace')
+
+
+EXTRACTORS = {
+    '.pdf': _extract_pdf,
+    '.docx': _extract_docx,
+    '.doc': _extract_doc,
+}
+
+
+def extract_text(path):
+    """
+    Extract normalized text from a resume file.
+    
+    Returns:
+        A (status, text, error) tuple where status is 'done', 'unsupported'
+        or 'failed'; safe to call in a child process.
+    """
+    extractor = EXTRACTORS.get(os.path.splitext(path)[1].lower())
+    if extractor is None:
+        return 'unsupported', '', f"No extractor for {os.path.basename(path)}"
+    try:
+        return 'done', normalize_text(extractor(path)), ''
+    except UnsupportedResume as e:
+        return 'unsupported', '', str(e)
+    except Exception as e:
+        return 'failed', '', f"{type(e).__name__}: {e}"
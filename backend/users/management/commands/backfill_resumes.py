@@ -0,0 +1,72 @@
+import os
+
+from django.core.files import File
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from applications.models import Application, ArchivedApplication
+from users.models import JobSeekerProfile, ResumeBlob
+from users.resume_pipeline import make_executor, process_batch
+from users.storage import BLOB_PREFIX, resume_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Move resumes stored before content addressing into the blob store and queue "
+        "them for text extraction. Safe to interrupt and re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+        parser.add_argument('--retry-failed', action='store_true',
+                            help="Queue blobs whose extraction failed for another attempt.")
+        parser.add_argument('--extract', action='store_true',
+                            help="Run extraction in this process until the queue is empty.")
+        parser.add_argument('--workers', type=int, default=None)
+
+    def handle(self, *args, **options):
+        imported = 0
+        missing = 0
+        for model in (JobSeekerProfile, Application, ArchivedApplication):
+            legacy = (
+                model.objects.exclude(Q(resume__isnull=True) | Q(resume='') | Q(resume__startswith=f"{BLOB_PREFIX}/"))
+                .order_by('pk')
+            )
+            last_pk = 0
+            while True:
+                batch = list(legacy.filter(pk__gt=last_pk).values_list('pk', 'resume')[:options['batch_size']])
+                if not batch:
+                    break
+                last_pk = batch[-1][0]
+                for _, name in batch:
+                    path = resume_storage.path(name)
+                    if not os.path.exists(path):
+                        missing += 1
+                        continue
+                    with open(path, 'rb') as handle:
+                        blob_name = resume_storage.save(name, File(handle, name=name))
+                    # Every row sharing the old file moves at once, so re-runs skip them
+                    for target in (JobSeekerProfile, Application, ArchivedApplication):
+                        target.objects.filter(resume=name).update(resume=blob_name)
+                    imported += 1
+            self.stdout.write(f"{model.__name__}: legacy resumes imported")
+
+        if options['retry_failed']:
+            requeued = ResumeBlob.objects.filter(extraction_status='failed').update(extraction_status='pending')
+            self.stdout.write(f"Re-queued {requeued} failed extractions")
+
+        pending = ResumeBlob.objects.filter(extraction_status='pending').count()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} legacy files ({missing} missing on disk); {pending} resumes pending extraction."
+        ))
+
+        if options['extract'] and pending:
+            total = 0
+            with make_executor(options['workers']) as executor:
+                while True:
+                    processed = process_batch(executor, options['batch_size'])
+                    if not processed:
+                        break
+                    total += processed
+                    self.stdout.write(f"Extracted {total}/{pending}")
+            self.stdout.write(self.style.SUCCESS(f"Extracted {total} resumes."))
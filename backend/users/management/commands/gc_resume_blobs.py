@@ -0,0 +1,127 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.fields.json import KT
+from django.utils import timezone
+
+from applications.models import Application, ArchivedApplication, QueuedApplication
+from users.models import JobSeekerProfile, ResumeBlob
+from users.storage import BLOB_PREFIX, resume_storage
+
+
+def blob_lookup(field, name=None):
+    return {field: name} if name else {f'{field}__startswith': f"{BLOB_PREFIX}/"}
+
+
+def count_references(name=None):
+    """Count references to every blob (or just one) with one grouped query per referencing column."""
+    references = Counter()
+    for model in (JobSeekerProfile, Application, ArchivedApplication, QueuedApplication):
+        rows = (
+            model.objects.filter(**blob_lookup('resume', name))
+            .order_by()
+            .values('resume')
+            .annotate(count=Count('pk'))
+        )
+        for row in rows:
+            references[row['resume']] += row['count']
+    # Candidate snapshots keep the resume the candidate had when applying
+    for model in (Application, ArchivedApplication):
+        rows = (
+            model.objects.filter(**blob_lookup('candidate_snapshot__resume', name))
+            .annotate(snapshot_resume=KT('candidate_snapshot__resume'))
+            .order_by()
+            .values('snapshot_resume')
+            .annotate(count=Count('pk'))
+        )
+        for row in rows:
+            references[row['snapshot_resume']] += row['count']
+    return references
+
+
+class Command(BaseCommand):
+    help = "Recount resume blob references and delete blobs nothing refers to any more."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace-hours', type=int, default=24,
+                            help="Keep unreferenced blobs younger than this (uploads still in flight).")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        references = count_references()
+
+        # Mark: store the exact reference count of every blob
+        changed = []
+        for blob in ResumeBlob.objects.only('pk', 'name', 'ref_count').iterator(chunk_size=options['batch_size']):
+            count = references.get(blob.name, 0)
+            if blob.ref_count != count:
+                blob.ref_count = count
+                changed.append(blob)
+        if not options['dry_run']:
+            ResumeBlob.objects.bulk_update(changed, ['ref_count'], batch_size=options['batch_size'])
+
+        # Sweep: delete unreferenced blobs past the grace period
+        cutoff = timezone.now() - timedelta(hours=options['grace_hours'])
+        garbage = ResumeBlob.objects.filter(ref_count=0, created_at__lt=cutoff)
+        if options['dry_run']:
+            garbage = [
+                blob for blob in ResumeBlob.objects.filter(created_at__lt=cutoff)
+                if references.get(blob.name, 0) == 0
+            ]
+            freed = sum(blob.size for blob in garbage)
+            orphans = self.sweep_orphan_files(cutoff, options['batch_size'], references, dry_run=True)
+            self.stdout.write(
+                f"Would delete {len(garbage)} blobs ({freed} bytes) and {orphans} orphan files; "
+                f"{len(changed)} counts would change."
+            )
+            return
+
+        deleted = 0
+        freed = 0
+        for blob in garbage.iterator(chunk_size=options['batch_size']):
+            with transaction.atomic():
+                # Re-check under lock in case a new reference appeared since the mark phase
+                locked = ResumeBlob.objects.select_for_update().filter(pk=blob.pk, ref_count=0).first()
+                if locked is None:
+                    continue
+                # The mark phase counted from an earlier snapshot; recount this blob now that it is locked
+                count = count_references(locked.name)[locked.name]
+                if count:
+                    locked.ref_count = count
+                    locked.save(update_fields=['ref_count'])
+                    continue
+                resume_storage.delete_blob(locked.name)
+                locked.delete()
+            deleted += 1
+            freed += blob.size
+        orphans = self.sweep_orphan_files(cutoff, options['batch_size'], references)
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {len(changed)} reference counts; deleted {deleted} blobs ({freed} bytes) "
+            f"and {orphans} orphan files."
+        ))
+    
+    def sweep_orphan_files(self, cutoff, batch_size, references, dry_run=False):
+        """
+        Delete blob files past the grace period that have no ResumeBlob row and no references.
+        
+        They are left behind when the request that wrote them rolled back, and
+        by uploads interrupted before their .part file was renamed. Files still
+        referenced are kept: uploads used to store repeated content under each
+        new extension without a row of its own.
+        """
+        deleted = 0
+        cutoff = cutoff.timestamp()
+        files = [name for name, modified in resume_storage.blob_files() if modified < cutoff]
+        for start in range(0, len(files), batch_size):
+            batch = files[start:start + batch_size]
+            known = set(ResumeBlob.objects.filter(name__in=batch).values_list('name', flat=True))
+            for name in batch:
+                if name not in known and not references.get(name):
+                    if not dry_run:
+                        resume_storage.delete_blob(name)
+                    deleted += 1
+        return deleted
@@ -0,0 +1,37 @@
+import signal
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.resume_pipeline import make_executor, process_batch
+
+
+class Command(BaseCommand):
+    help = "Extract text from newly stored resumes in a process pool until stopped."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Extraction processes (default: one per CPU core).")
+        parser.add_argument('--poll-interval', type=float, default=5.0,
+                            help="Seconds to sleep when nothing is pending.")
+        parser.add_argument('--once', action='store_true',
+                            help="Exit once nothing is pending instead of polling.")
+
+    def handle(self, *args, **options):
+        stopping = []
+        signal.signal(signal.SIGTERM, lambda signum, frame: stopping.append(signum))
+        signal.signal(signal.SIGINT, lambda signum, frame: stopping.append(signum))
+
+        total = 0
+        with make_executor(options['workers']) as executor:
+            while not stopping:
+                processed = process_batch(executor, options['batch_size'])
+                total += processed
+                if processed:
+                    self.stdout.write(f"Extracted {processed} resumes")
+                elif options['once']:
+                    break
+                else:
+                    time.sleep(options['poll_interval'])
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} resumes."))
@@ -1,9 +1,13 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.translation import gettext_lazy as _
 import os
 from uuid import uuid4
 
+from .storage import resume_storage
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -79,7 +83,7 @@ class JobSeekerProfile(models.Model):
     full_name = models.CharField(max_length=255)
     title = models.CharField(max_length=255, blank=True)
     location = models.CharField(max_length=255, blank=True)
-    resume = models.FileField(upload_to=resume_upload_path, blank=True, null=True)
+    resume = models.FileField(upload_to=resume_upload_path, storage=resume_storage, blank=True, null=True)
     about = models.TextField(blank=True)
     
     def __str__(self):
@@ -93,6 +97,42 @@ class JobSeekerProfile(models.Model):
         return int((filled_fields / len(fields)) * 100)
 
 
+class ResumeBlob(models.Model):
+    """A stored resume file, shared by every profile and application with the same content."""
+    
+    EXTRACTION_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('unsupported', 'Unsupported'),
+        ('failed', 'Failed'),
+    ]
+    
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, db_index=True)
+    size = models.PositiveBigIntegerField(default=0)
+    # Incremented on every save that resolves to this blob; recounted exactly by gc_resume_blobs
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Filled in off the request path by `manage.py run_resume_extractor`
+    text = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    extraction_status = models.CharField(max_length=12, choices=EXTRACTION_STATUS_CHOICES, default='pending')
+    extraction_error = models.TextField(blank=True)
+    extraction_claimed_at = models.DateTimeField(null=True, blank=True)
+    extracted_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['extraction_status', 'created_at'], name='resumeblob_extraction_idx'),
+            GinIndex(fields=['search_vector'], name='resumeblob_search_gin'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
 class CompanyProfile(models.Model):
     """Profile for Company user type."""
     
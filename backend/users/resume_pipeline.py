@@ -0,0 +1,89 @@
+# users/resume_pipeline.py
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from django.contrib.postgres.search import SearchVector
+from django.db import connections, models, transaction
+from django.db.models import Q, Value
+from django.utils import timezone
+
+from .extraction import extract_text
+from .models import ResumeBlob
+from .storage import resume_storage
+
+logger = logging.getLogger(__name__)
+
+# A claim older than this belongs to a worker that died; the blob is retried
+CLAIM_TIMEOUT = timedelta(minutes=15)
+
+
+def claim_batch(batch_size):
+    """
+    Mark a batch of pending (or abandoned) blobs as processing and return them.
+    
+    The claim is committed before extraction starts, so concurrent extractors
+    never work on the same blob and a crash only delays the batch by CLAIM_TIMEOUT.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        blobs = list(
+            ResumeBlob.objects.filter(
+                Q(extraction_status='pending')
+                | Q(extraction_status='processing', extraction_claimed_at__lt=now - CLAIM_TIMEOUT)
+            )
+            .select_for_update(skip_locked=True)
+            .order_by('created_at')
+            .only('pk', 'name')[:batch_size]
+        )
+        ResumeBlob.objects.filter(pk__in=[blob.pk for blob in blobs]).update(
+            extraction_status='processing', extraction_claimed_at=now
+        )
+    return blobs
+
+
+def store_result(blob, status, text, error):
+    """Save extracted text and its search vector, then re-index applications using the blob."""
+    from applications.models import Application
+    from applications.search import refresh_search_vectors, uses_resume
+    
+    ResumeBlob.objects.filter(pk=blob.pk).update(
+        text=text,
+        search_vector=SearchVector(Value(text, output_field=models.TextField()), config='english'),
+        extraction_status=status,
+        extraction_error=error,
+        extracted_at=timezone.now(),
+    )
+    if text:
+        refresh_search_vectors(Application.objects.filter(uses_resume(blob.name)))
+
+
+def process_batch(executor, batch_size):
+    """
+    Extract one claimed batch across the process pool.
+    
+    Returns:
+        The number of blobs processed
+    """
+    blobs = claim_batch(batch_size)
+    if not blobs:
+        return 0
+    paths = [resume_storage.path(blob.name) for blob in blobs]
+    for blob, path, (status, text, error) in zip(blobs, paths, executor.map(_extract_if_present, paths)):
+        if status != 'done':
+            logger.info("Resume %s extraction %s: %s", blob.name, status, error)
+        store_result(blob, status, text, error)
+    return len(blobs)
+
+
+def _extract_if_present(path):
+    if not os.path.exists(path):
+        return 'failed', '', "File is missing from storage"
+    return extract_text(path)
+
+
+def make_executor(workers=None):
+    """Process pool for extraction; database connections are closed so children never share them."""
+    connections.close_all()
+    return ProcessPoolExecutor(max_workers=workers or os.cpu_count())
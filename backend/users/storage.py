@@ -0,0 +1,97 @@
+# users/storage.py
+import hashlib
+import os
+from uuid import uuid4
+
+from django.core.files.storage import FileSystemStorage
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+BLOB_PREFIX = 'resume_blobs'
+
+
+def hash_content(content):
+    """SHA-256 of a file, reusing the digest computed during upload when available."""
+    digest = getattr(content, 'sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return hasher.hexdigest()
+
+
+def blob_name_for(digest, filename):
+    ext = os.path.splitext(filename)[1].lower()
+    return f"{BLOB_PREFIX}/{digest[:2]}/{digest}{ext}"
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Storage that names files by the SHA-256 of their content.
+    
+    Saving a file whose content is already stored returns the existing name
+    (extension included) without writing anything, so identical resumes occupy disk once. Blobs are
+    shared between records, so deleting through a field is a no-op; unused
+    blobs are removed by `manage.py gc_resume_blobs`.
+    """
+    
+    def get_available_name(self, name, max_length=None):
+        return name
+    
+    def _save(self, name, content):
+        from .models import ResumeBlob
+        
+        digest = hash_content(content)
+        # Row first: the increment waits on a garbage collector holding the row, and finding
+        # the row gone afterwards recreates it before the file is checked below
+        incremented = ResumeBlob.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1)
+        blob, created = ResumeBlob.objects.get_or_create(
+            sha256=digest, defaults={'name': blob_name_for(digest, name), 'size': content.size, 'ref_count': 1}
+        )
+        if not incremented and not created:
+            # Stored by a concurrent upload between the two statements
+            ResumeBlob.objects.filter(pk=blob.pk).update(ref_count=F('ref_count') + 1)
+        # The same bytes keep the name they were first stored under, whatever this upload's extension
+        name = blob.name
+        
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            # Refresh the age the collector's orphan sweep looks at, in case this
+            # transaction rolls back after a collector deleted the old row
+            os.utime(full_path)
+        else:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            partial_path = f"{full_path}.{uuid4().hex}.part"
+            with open(partial_path, 'wb') as handle:
+                for chunk in content.chunks():
+                    handle.write(chunk)
+            # Racing writers hold identical bytes, so the last rename wins harmlessly
+            os.replace(partial_path, full_path)
+        return name
+    
+    def delete(self, name):
+        if name and name.startswith(f"{BLOB_PREFIX}/"):
+            return
+        super().delete(name)
+    
+    def delete_blob(self, name):
+        """Physically remove a blob; only the garbage collector calls this."""
+        super().delete(name)
+    
+    def blob_files(self):
+        """Yield (name, modified time) of every file under the blob prefix, leftover .part files included."""
+        root = self.path(BLOB_PREFIX)
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                full_path = os.path.join(directory, filename)
+                name = os.path.relpath(full_path, self.location).replace(os.sep, '/')
+                yield name, os.path.getmtime(full_path)
+
+
+resume_storage = ContentAddressedStorage()